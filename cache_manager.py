@@ -11,6 +11,8 @@ import json
 import functools
 import hashlib
 import os
+from collections import OrderedDict
+from concurrent.futures import Future
 from typing import Any, Dict, Optional, Callable, Tuple
 from dotenv import load_dotenv
 
@@ -41,7 +43,8 @@ class CacheItem:
 class CacheManager:
     """
     Cache manager for storing frequently accessed data.
-    Implements a simple in-memory cache with TTL (time to live).
+    Implements a simple in-memory cache with TTL (time to live),
+    bounded to a maximum number of items with least-recently-used eviction.
     """
     
     _instance = None
@@ -60,9 +63,10 @@ class CacheManager:
         if self._initialized:
             return
             
-        self._cache: Dict[str, CacheItem] = {}
+        self._cache: "OrderedDict[str, CacheItem]" = OrderedDict()
         self._lock = threading.Lock()
         self._default_ttl = int(os.environ.get('CACHE_TTL', 3600))  # Default 1 hour
+        self._max_size = int(os.environ.get('CACHE_MAX_SIZE', 1000))
         self._cleanup_thread = None
         self._running = False
         
@@ -70,7 +74,8 @@ class CacheManager:
         self._start_cleanup_thread()
         
         self._initialized = True
-        logger.info("Cache manager initialized", default_ttl=self._default_ttl)
+        logger.info("Cache manager initialized", default_ttl=self._default_ttl,
+                   max_size=self._max_size)
     
     def _start_cleanup_thread(self):
         """Start a background thread to clean up expired cache items."""
@@ -119,6 +124,7 @@ class CacheManager:
                     del self._cache[key]
                     logger.debug(f"Cache miss (expired): {key}")
                     return None
+                self._cache.move_to_end(key)
                 logger.debug(f"Cache hit: {key}")
                 return item.value
             
@@ -128,7 +134,7 @@ class CacheManager:
     @track_performance
     def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
         """
-        Set a value in the cache.
+        Set a value in the cache, evicting the least recently used item if full.
         
         Args:
             key: Cache key
@@ -140,6 +146,10 @@ class CacheManager:
             
         with self._lock:
             self._cache[key] = CacheItem(value, ttl)
+            self._cache.move_to_end(key)
+            if len(self._cache) > self._max_size:
+                evicted, _ = self._cache.popitem(last=False)
+                logger.debug(f"Cache evict: {evicted}")
             logger.debug(f"Cache set: {key} (TTL: {ttl}s)")
     
     @track_performance
@@ -184,16 +194,23 @@ class CacheManager:
                 "total_items": total_items,
                 "expired_items": expired_items,
                 "active_items": total_items - expired_items,
-                "default_ttl": self._default_ttl
+                "default_ttl": self._default_ttl,
+                "max_size": self._max_size
             }
 
-def cached(ttl: Optional[int] = None, key_func: Optional[Callable] = None):
+def cached(ttl: Optional[int] = None, key_func: Optional[Callable] = None, method: bool = False):
     """
     Decorator for caching function results.
     
+    Concurrent cache misses for the same key are collapsed into a single call:
+    the first caller runs the function and the others wait for its result.
+    
     Args:
         ttl: Time to live in seconds (uses default if None)
         key_func: Optional function to generate cache key from function arguments
+        method: If True, the decorated function is a method and its first
+            argument (self) is left out of the default cache key, so every
+            instance shares the same entries
         
     Returns:
         Decorated function with caching
@@ -201,6 +218,10 @@ def cached(ttl: Optional[int] = None, key_func: Optional[Callable] = None):
     cache_manager = CacheManager()
     
     def decorator(func):
+        # Calls currently running for a cache key, shared with concurrent callers
+        inflight: Dict[str, Future] = {}
+        inflight_lock = threading.Lock()
+        
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             # Generate cache key
@@ -210,8 +231,9 @@ def cached(ttl: Optional[int] = None, key_func: Optional[Callable] = None):
                 # Default key generation based on function name and arguments
                 key_parts = [func.__module__, func.__name__]
                 
-                # Add args to key
-                for arg in args:
+                # Add args to key; str(self) holds the instance's address, which
+                # would split the cache per instance and can be reused later
+                for arg in (args[1:] if method else args):
                     try:
                         key_parts.append(str(arg))
                     except:
@@ -233,13 +255,30 @@ def cached(ttl: Optional[int] = None, key_func: Optional[Callable] = None):
             if cached_value is not None:
                 return cached_value
             
-            # Not in cache, call the function
-            result = func(*args, **kwargs)
+            # Not in cache; join a call already in flight for this key, if any
+            with inflight_lock:
+                future = inflight.get(cache_key)
+                leader = future is None
+                if leader:
+                    future = inflight[cache_key] = Future()
             
-            # Store in cache
-            cache_manager.set(cache_key, result, ttl)
+            if not leader:
+                return future.result()
             
-            return result
+            # Call the function and share the outcome with anyone waiting
+            try:
+                result = func(*args, **kwargs)
+                
+                # Store in cache
+                cache_manager.set(cache_key, result, ttl)
+                future.set_result(result)
+                return result
+            except BaseException as e:
+                future.set_exception(e)
+                raise
+            finally:
+                with inflight_lock:
+                    del inflight[cache_key]
         
         return wrapper
     
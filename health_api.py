@@ -7,6 +7,7 @@ the health_check module to expose system health information via the web API.
 
 import os
 import time
+import psutil
 from flask import Blueprint, jsonify, request
 from datetime import datetime
 import json
@@ -18,7 +19,10 @@ from health_check import health_check_service
 from db_manager import DBManager
 
 # Import Supabase client
-from supabase_client import SupabaseClient
+from supabase_client import get_supabase_client
+
+# Import the shared cache behind the Supabase client's @cached queries
+from cache_manager import cache_manager
 
 # Import monitoring module
 from monitoring import logger, track_performance
@@ -153,7 +157,7 @@ def supabase_health():
         JSON: Supabase connection health information
     """
     try:
-        supabase_client = SupabaseClient()
+        supabase_client = get_supabase_client()
         result = {
             'status': 'healthy',
             'timestamp': datetime.utcnow().isoformat(),
@@ -169,7 +173,7 @@ def supabase_health():
                 'connection': 'successful',
                 'user_count': response.count if hasattr(response, 'count') else 'unknown',
                 'cache_stats': {
-                    'size': len(supabase_client._cache),
+                    'size': cache_manager.get_stats()['active_items'],
                     'hit_rate': supabase_client.cache_hit_rate if hasattr(supabase_client, 'cache_hit_rate') else 'unknown'
                 }
             }
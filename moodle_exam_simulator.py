@@ -9,14 +9,150 @@ import sys
 import json
 import os
 import time
-import tempfile
 import traceback
+import threading
+import hashlib
+import shlex
+import tempfile
 from typing import Dict, Any, Tuple, List, Optional
 import importlib
 
 # Lazy import docker to speed up initial loading
 docker = None
 
+# Driver modules imported on first use, shared by every CodeTester instance
+_LAZY: Dict[str, Any] = {}
+
+def _lazy_import(module_name: str):
+    """Import a module the first time it is needed and cache it in _LAZY"""
+    module = _LAZY.get(module_name)
+    if module is None:
+        module = _LAZY[module_name] = importlib.import_module(module_name)
+    return module
+
+# Prefer orjson's faster parser for pasted JSON, falling back to the stdlib
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Captured output per stream is capped so a runaway submission can't exhaust memory
+_MAX_CAPTURE_BYTES = 256 * 1024
+_TRUNCATION_MARKER = b"\n... [output truncated]\n"
+
+def _run_bounded(cmd: List[str], timeout: float, stdin: Optional[str] = None) -> Tuple[int, str, str]:
+    """Run a command with a hard wall-clock limit and bounded output capture.
+    
+    Unlike subprocess.run(timeout=...), the process is killed as soon as the
+    deadline passes or either stream overflows the capture cap, so a
+    submission spamming stdout can't keep us draining pipes. The pipes are
+    read in threads rather than with selectors, which don't support pipes on
+    Windows.
+    
+    When stdin is None the child inherits ours, so interactive input() works.
+    
+    Returns:
+        Tuple of (return code, stdout, stderr)
+    
+    Raises:
+        subprocess.TimeoutExpired: If the command runs longer than timeout seconds
+    """
+    process = subprocess.Popen(cmd, stdin=None if stdin is None else subprocess.PIPE,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    captured = {process.stdout: bytearray(), process.stderr: bytearray()}
+    truncated = set()
+    
+    def drain(stream):
+        buffer = captured[stream]
+        try:
+            for chunk in iter(lambda: os.read(stream.fileno(), 65536), b""):
+                room = _MAX_CAPTURE_BYTES - len(buffer)
+                buffer += chunk[:room]
+                if len(chunk) > room:
+                    truncated.add(stream)
+                    process.kill()
+                    break
+        finally:
+            stream.close()
+    
+    def feed():
+        try:
+            process.stdin.write(stdin.encode())
+            process.stdin.close()
+        except OSError:
+            # The child exited (or was killed) before reading all of its input
+            pass
+    
+    threads = [threading.Thread(target=drain, args=(stream,), daemon=True) for stream in captured]
+    if stdin is not None:
+        threads.append(threading.Thread(target=feed, daemon=True))
+    for thread in threads:
+        thread.start()
+    
+    try:
+        returncode = process.wait(timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+        raise
+    finally:
+        # A grandchild still holding the pipes open mustn't hang us
+        for thread in threads:
+            thread.join(1)
+    
+    stdout, stderr = (
+        (bytes(captured[stream]) + (_TRUNCATION_MARKER if stream in truncated else b""))
+        .decode(errors="replace")
+        for stream in (process.stdout, process.stderr)
+    )
+    return returncode, stdout, stderr
+
+def _run_python_source(source: str, timeout: float) -> Tuple[int, str, str]:
+    """Run Python source from a temporary script through _run_bounded.
+    
+    The source goes in a file rather than through stdin so submissions can
+    still call input(). -E ignores PYTHONPATH and friends but, unlike -I,
+    keeps user site-packages where pip may have installed the drivers.
+    """
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False, encoding='utf-8') as f:
+        f.write(source)
+    try:
+        return _run_bounded([sys.executable, "-E", f.name], timeout)
+    finally:
+        os.unlink(f.name)
+
+# Database containers used for exam practice
+DB_CONFIGS = {
+    'neo4j': {
+        'image': 'neo4j:latest',
+        'environment': {
+            'NEO4J_AUTH': 'neo4j/password123',
+            'NEO4J_dbms_memory_heap_max__size': '512M'
+        },
+        'ports': {'7687/tcp': 7688, '7474/tcp': 7475},
+        'name': 'exam_neo4j',
+        'display_port': '7687'
+    },
+    'mongodb': {
+        'image': 'mongo:latest',
+        'environment': {},
+        'ports': {'27017/tcp': 27018},
+        'name': 'exam_mongodb',
+        'display_port': '27017'
+    },
+    'mysql': {
+        'image': 'mysql:latest',
+        'environment': {
+            'MYSQL_ROOT_PASSWORD': 'password123',
+            'MYSQL_DATABASE': 'exam_db'
+        },
+        'ports': {'3306/tcp': 3307},
+        'name': 'exam_mysql',
+        'display_port': '3306'
+    }
+}
+
 class ExamEnvironmentSimulator:
     """Simulates database environments using Docker containers."""
     
@@ -35,7 +171,7 @@ class ExamEnvironmentSimulator:
         try:
             # Import docker only when needed
             if docker is None:
-                docker = importlib.import_module('docker')
+                docker = _lazy_import('docker')
                 
             self.docker_client = docker.from_env()
             print("✓ Docker connection successful")
@@ -48,8 +184,15 @@ class ExamEnvironmentSimulator:
             print("Make sure Docker Desktop is running!")
             return False
     
-    def start_databases(self):
-        """Start required databases as Docker containers for testing"""
+    def start_databases(self, fresh: bool = False):
+        """Start required databases as Docker containers for testing
+        
+        Containers left over from a previous session are reused instead of
+        recreated, so repeat sessions attach almost instantly.
+        
+        Args:
+            fresh: If True, remove any existing exam containers and start new ones
+        """
         print("\n🚀 Starting databases...")
         
         # Ensure Docker is initialized
@@ -57,63 +200,78 @@ class ExamEnvironmentSimulator:
             print("❌ Cannot start databases: Docker not available")
             return False
         
-        # Define database configurations
-        db_configs = {
-            'neo4j': {
-                'image': 'neo4j:latest',
-                'environment': {
-                    'NEO4J_AUTH': 'neo4j/password123',
-                    'NEO4J_dbms_memory_heap_max__size': '512M'
-                },
-                'ports': {'7687/tcp': 7688, '7474/tcp': 7475},
-                'name': 'exam_neo4j',
-                'display_port': '7687'
-            },
-            'mongodb': {
-                'image': 'mongo:latest',
-                'environment': {},
-                'ports': {'27017/tcp': 27018},
-                'name': 'exam_mongodb',
-                'display_port': '27017'
-            },
-            'mysql': {
-                'image': 'mysql:latest',
-                'environment': {
-                    'MYSQL_ROOT_PASSWORD': 'password123',
-                    'MYSQL_DATABASE': 'exam_db'
-                },
-                'ports': {'3306/tcp': 3307},
-                'name': 'exam_mysql',
-                'display_port': '3306'
-            }
-        }
-        
         # Start each database
         success_count = 0
-        for db_type, config in db_configs.items():
+        started_count = 0
+        for db_type, config in DB_CONFIGS.items():
             try:
+                existing = self._get_container(config['name'])
+                if existing is not None and fresh:
+                    existing.remove(force=True)
+                    existing = None
+                
+                if existing is not None:
+                    if existing.status != 'running':
+                        existing.start()
+                        started_count += 1
+                    self.containers[db_type] = existing
+                    print(f"✓ {db_type.capitalize()} reused (port: {config['display_port']})")
+                    success_count += 1
+                    continue
+                
                 container = self.docker_client.containers.run(
                     config['image'],
                     environment=config['environment'],
                     ports=config['ports'],
                     detach=True,
-                    name=config['name'],
-                    remove=True
+                    name=config['name']
                 )
                 self.containers[db_type] = container
                 print(f"✓ {db_type.capitalize()} started (port: {config['display_port']})")
                 success_count += 1
+                started_count += 1
             except Exception as e:
                 print(f"⚠️ Failed to start {db_type.capitalize()}: {e}")
         
         if success_count > 0:
-            wait_time = int(os.environ.get('DB_STARTUP_WAIT_TIME', '15'))
-            print(f"\n⏳ Waiting for databases to be ready ({wait_time} seconds)...")
-            time.sleep(wait_time)
+            # Containers that were already running don't need a warm-up period
+            if started_count > 0:
+                wait_time = int(os.environ.get('DB_STARTUP_WAIT_TIME', '15'))
+                print(f"\n⏳ Waiting for databases to be ready ({wait_time} seconds)...")
+                time.sleep(wait_time)
             return True
         else:
             print("❌ No databases were started successfully.")
             return False
+    
+    def attach_running_databases(self) -> bool:
+        """Attach to exam containers that are already running
+        
+        Returns:
+            True if every exam container was found running and attached
+        """
+        if not self.docker_client and not self.setup_docker():
+            return False
+        
+        attached = {}
+        for db_type, config in DB_CONFIGS.items():
+            try:
+                existing = self._get_container(config['name'])
+            except Exception:
+                return False
+            if existing is None or existing.status != 'running':
+                return False
+            attached[db_type] = existing
+        
+        self.containers.update(attached)
+        return True
+    
+    def _get_container(self, name: str):
+        """Return the container with the given name, or None if it doesn't exist"""
+        try:
+            return self.docker_client.containers.get(name)
+        except docker.errors.NotFound:
+            return None
         
     def stop_databases(self):
         """Stop containers and clean up resources"""
@@ -144,6 +302,10 @@ class CodeTester:
         # Database modules will be imported only when needed
         self._neo4j_driver = None
         self._mongo_client = None
+        # Reusable in-memory SQLite connections keyed by (thread id, session key)
+        self._sqlite_sessions: Dict[Tuple[int, str], Any] = {}
+        self._sqlite_applied_setups: Dict[Tuple[int, str], set] = {}
+        self._sqlite_lock = threading.Lock()
         
     def test_python_code(self, code: str, expected_output: str = None, 
                         test_cases: List[Dict] = None) -> Dict[str, Any]:
@@ -156,46 +318,31 @@ class CodeTester:
             "test_results": []
         }
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-            f.write(code)
-            f.flush()
+        try:
+            returncode, result["output"], result["error"] = _run_python_source(code, timeout=10)
             
-            try:
-                # Run the code
-                process = subprocess.run(
-                    [sys.executable, f.name],
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
+            if returncode == 0:
+                result["success"] = True
                 
-                result["output"] = process.stdout
-                result["error"] = process.stderr
+                # Run test cases
+                if test_cases:
+                    for test in test_cases:
+                        test_result = self._run_test_case(code, test)
+                        result["test_results"].append(test_result)
                 
-                if process.returncode == 0:
-                    result["success"] = True
+                # Check expected output
+                if expected_output and result["output"].strip() != expected_output.strip():
+                    result["success"] = False
+                    result["error"] = f"Output doesn't match!\nExpected: {expected_output}\nReceived: {result['output']}"
                     
-                    # Run test cases
-                    if test_cases:
-                        for test in test_cases:
-                            test_result = self._run_test_case(f.name, test)
-                            result["test_results"].append(test_result)
-                    
-                    # Check expected output
-                    if expected_output and result["output"].strip() != expected_output.strip():
-                        result["success"] = False
-                        result["error"] = f"Output doesn't match!\nExpected: {expected_output}\nReceived: {result['output']}"
-                        
-            except subprocess.TimeoutExpired:
-                result["error"] = "Code execution timed out (10 seconds)"
-            except Exception as e:
-                result["error"] = f"Error: {str(e)}"
-            finally:
-                os.unlink(f.name)
-                
+        except subprocess.TimeoutExpired:
+            result["error"] = "Code execution timed out (10 seconds)"
+        except Exception as e:
+            result["error"] = f"Error: {str(e)}"
+            
         return result
     
-    def _run_test_case(self, filename: str, test_case: Dict) -> Dict:
+    def _run_test_case(self, code: str, test_case: Dict) -> Dict:
         """Run a single test case"""
         test_result = {
             "name": test_case.get("name", "Test"),
@@ -204,23 +351,14 @@ class CodeTester:
         }
         
         try:
-            # Prepare test input
-            test_code = f"""
-{test_case.get('setup', '')}
-exec(open('{filename}').read())
-{test_case.get('test', '')}
-"""
-            process = subprocess.run(
-                [sys.executable, "-c", test_code],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
+            # Prepare test input: setup, then the submission, then the test itself
+            combined_code = "\n".join([test_case.get('setup', ''), code, test_case.get('test', '')])
+            returncode, _, stderr = _run_python_source(combined_code, timeout=5)
             
-            if process.returncode == 0:
+            if returncode == 0:
                 test_result["passed"] = True
             else:
-                test_result["error"] = process.stderr
+                test_result["error"] = stderr
                 
         except Exception as e:
             test_result["error"] = str(e)
@@ -239,26 +377,25 @@ exec(open('{filename}').read())
         
         try:
             # Import Neo4j only when needed
-            if not hasattr(self, 'GraphDatabase') or self.GraphDatabase is None:
-                try:
-                    from neo4j import GraphDatabase
-                    self.GraphDatabase = GraphDatabase
-                except ImportError:
-                    result["error"] = "Neo4j library not installed. Run: pip install neo4j"
-                    return result
+            try:
+                GraphDatabase = _lazy_import('neo4j').GraphDatabase
+            except ImportError:
+                result["error"] = "Neo4j library not installed. Run: pip install neo4j"
+                return result
             
             # Connect to Neo4j
-            driver = self.GraphDatabase.driver("bolt://localhost:7688", auth=("neo4j", "password123"))
+            driver = GraphDatabase.driver("bolt://localhost:7688", auth=("neo4j", "password123"))
             
-            with driver.session() as session:
-                # Run setup queries
-                if setup_queries:
-                    for setup_query in setup_queries:
-                        session.run(setup_query)
+            # Naming the database explicitly skips the default-database lookup
+            with driver.session(database="neo4j") as session:
+                # Run the setup queries and the query itself in one transaction,
+                # consuming the records before it commits
+                def run_all(tx):
+                    for setup_query in setup_queries or []:
+                        tx.run(setup_query).consume()
+                    return list(tx.run(query))
                 
-                # Execute the query
-                query_result = session.run(query)
-                records = list(query_result)
+                records = session.write_transaction(run_all)
                 
                 # Format the output
                 if records:
@@ -280,8 +417,20 @@ exec(open('{filename}').read())
     
     def test_mongodb_query(self, db_name: str, collection_name: str, 
                           operation: str, query_data: Dict = None,
-                          setup_data: List[Dict] = None) -> Dict[str, Any]:
-        """Test MongoDB query with lazy importing"""
+                          setup_data: List[Dict] = None, reset: bool = True,
+                          indexes: List[Any] = None) -> Dict[str, Any]:
+        """Test MongoDB query with lazy importing
+        
+        Args:
+            db_name: Database name
+            collection_name: Collection name
+            operation: Operation to run (find, insert_one, update_many, aggregate, ...)
+            query_data: Operation argument (filter, document(s) or pipeline)
+            setup_data: Documents to load before running the operation; ones with an
+                _id are upserted, the rest inserted
+            reset: If True (the default), clear the collection before loading setup_data
+            indexes: Optional index keys to create on the collection before the operation
+        """
         result = {
             "language": "MongoDB",
             "success": False,
@@ -292,29 +441,37 @@ exec(open('{filename}').read())
         
         try:
             # Import MongoDB only when needed
-            if not hasattr(self, 'MongoClient') or self.MongoClient is None:
-                try:
-                    from pymongo import MongoClient
-                    from bson.objectid import ObjectId
-                    self.MongoClient = MongoClient
-                    self.ObjectId = ObjectId
-                except ImportError:
-                    result["error"] = "PyMongo library not installed. Run: pip install pymongo"
-                    return result
+            try:
+                pymongo = _lazy_import('pymongo')
+            except ImportError:
+                result["error"] = "PyMongo library not installed. Run: pip install pymongo"
+                return result
             
             # Connect to MongoDB
-            client = self.MongoClient('mongodb://localhost:27018/', serverSelectionTimeoutMS=5000)
+            client = pymongo.MongoClient('mongodb://localhost:27018/', serverSelectionTimeoutMS=5000)
             # Test connection
             client.admin.command('ping')
             
             db = client[db_name]
             collection = db[collection_name]
             
-            # Clear collection before running tests for clean state
-            if setup_data is not None:
-                collection.delete_many({})  # Clear collection
-                if setup_data:  # Only insert if setup_data is not empty
-                    collection.insert_many(setup_data)
+            # Start from an empty collection unless the caller opts out
+            if reset:
+                collection.delete_many({})
+            
+            # Upsert documents that name their _id so repeat runs are idempotent;
+            # the rest are inserted and get ObjectIds as usual
+            if setup_data:
+                operations = [
+                    pymongo.ReplaceOne({'_id': doc['_id']}, doc, upsert=True) if '_id' in doc
+                    else pymongo.InsertOne(doc)
+                    for doc in setup_data
+                ]
+                collection.bulk_write(operations, ordered=False)
+            
+            if indexes:
+                for index in indexes:
+                    collection.create_index(index)
                 
             # Execute operation with better error handling
             if operation == 'find':
@@ -377,9 +534,49 @@ exec(open('{filename}').read())
             
         return result
     
+    def _connect_sqlite(self):
+        """Open an in-memory SQLite connection tuned for throwaway data"""
+        conn = _lazy_import('sqlite3').connect(':memory:')
+        # The database never touches disk, so journaling and fsync buy nothing
+        conn.execute("PRAGMA journal_mode=MEMORY")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+    
+    def _get_sqlite_session(self, session_key: str):
+        """Return the calling thread's SQLite connection for a session, creating it on first use"""
+        key = (threading.get_ident(), session_key)
+        with self._sqlite_lock:
+            conn = self._sqlite_sessions.get(key)
+            if conn is None:
+                conn = self._connect_sqlite()
+                self._sqlite_sessions[key] = conn
+                self._sqlite_applied_setups[key] = set()
+            return conn, self._sqlite_applied_setups[key]
+    
+    def close_sqlite_sessions(self):
+        """Close all SQLite session connections opened via session_key"""
+        with self._sqlite_lock:
+            for conn in self._sqlite_sessions.values():
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            self._sqlite_sessions.clear()
+            self._sqlite_applied_setups.clear()
+    
     def test_sql_query(self, query: str, db_type: str = "sqlite",
-                      setup_queries: List[str] = None) -> Dict[str, Any]:
-        """Test SQL query with lazy importing"""
+                      setup_queries: List[str] = None,
+                      session_key: Optional[str] = None) -> Dict[str, Any]:
+        """Test SQL query with lazy importing
+        
+        Args:
+            query: SQL query to test
+            db_type: Database type (sqlite, mysql or postgresql)
+            setup_queries: Queries to run before the main query
+            session_key: For SQLite, reuse an in-memory database across calls with
+                the same key; identical setup blocks are only applied once
+        """
         result = {
             "language": f"SQL ({db_type})",
             "success": False,
@@ -390,29 +587,30 @@ exec(open('{filename}').read())
         
         conn = None
         cursor = None
+        applied_setups = None
+        setup_hash = None
         
         try:
             # Connect to the database based on type with lazy imports
             if db_type == "sqlite":
-                if not hasattr(self, 'sqlite3') or self.sqlite3 is None:
-                    try:
-                        import sqlite3
-                        self.sqlite3 = sqlite3
-                    except ImportError:
-                        result["error"] = "sqlite3 module not available"
-                        return result
-                conn = self.sqlite3.connect(':memory:')
+                try:
+                    _lazy_import('sqlite3')
+                except ImportError:
+                    result["error"] = "sqlite3 module not available"
+                    return result
+                if session_key is not None:
+                    conn, applied_setups = self._get_sqlite_session(session_key)
+                else:
+                    conn = self._connect_sqlite()
                 
             elif db_type == "mysql":
-                if not hasattr(self, 'mysql_connector') or self.mysql_connector is None:
-                    try:
-                        import mysql.connector
-                        self.mysql_connector = mysql.connector
-                    except ImportError:
-                        result["error"] = "MySQL Connector not installed. Run: pip install mysql-connector-python"
-                        return result
+                try:
+                    mysql_connector = _lazy_import('mysql.connector')
+                except ImportError:
+                    result["error"] = "MySQL Connector not installed. Run: pip install mysql-connector-python"
+                    return result
                 try:    
-                    conn = self.mysql_connector.connect(
+                    conn = mysql_connector.connect(
                         host="localhost",
                         port=3307,
                         user="root",
@@ -425,15 +623,13 @@ exec(open('{filename}').read())
                     return result
                 
             elif db_type == "postgresql":
-                if not hasattr(self, 'psycopg2') or self.psycopg2 is None:
-                    try:
-                        import psycopg2
-                        self.psycopg2 = psycopg2
-                    except ImportError:
-                        result["error"] = "psycopg2 not installed. Run: pip install psycopg2-binary"
-                        return result
                 try:
-                    conn = self.psycopg2.connect(
+                    psycopg2 = _lazy_import('psycopg2')
+                except ImportError:
+                    result["error"] = "psycopg2 not installed. Run: pip install psycopg2-binary"
+                    return result
+                try:
+                    conn = psycopg2.connect(
                         host="localhost",
                         port=5432,
                         user="postgres",
@@ -450,6 +646,12 @@ exec(open('{filename}').read())
                 
             cursor = conn.cursor()
             
+            # Skip setup blocks that were already applied to this session
+            if setup_queries and applied_setups is not None:
+                setup_hash = hashlib.blake2b("\0".join(setup_queries).encode()).hexdigest()
+                if setup_hash in applied_setups:
+                    setup_queries = None
+            
             # Execute setup queries with better error handling
             if setup_queries:
                 for i, setup_query in enumerate(setup_queries):
@@ -459,6 +661,8 @@ exec(open('{filename}').read())
                         result["error"] = f"Error in setup query #{i+1}: {str(e)}\nQuery: {setup_query}"
                         return result
                 conn.commit()
+                if setup_hash is not None:
+                    applied_setups.add(setup_hash)
             
             # Execute main query
             cursor.execute(query)
@@ -499,25 +703,29 @@ exec(open('{filename}').read())
         finally:
             if cursor:
                 cursor.close()
-            if conn:
+            # Session connections stay open for the next call
+            if conn and applied_setups is None:
                 conn.close()
                 
         return result
 
 
 class ExamPracticeSystem:
-    def __init__(self):
+    def __init__(self, fresh: bool = False):
         self.env_simulator = ExamEnvironmentSimulator()
         self.code_tester = CodeTester()
+        self.fresh = fresh
         
     def start(self):
         """Start system"""
         print("🎓 Moodle Exam Environment Simulator")
         print("=" * 50)
         
-        # Start databases
-        if input("\nDo you want to start databases in Docker? (y/n): ").lower() == 'y':
-            self.env_simulator.start_databases()
+        # Start databases, attaching directly if a previous session left them running
+        if not self.fresh and self.env_simulator.attach_running_databases():
+            print("✓ Reusing running exam databases")
+        elif input("\nDo you want to start databases in Docker? (y/n): ").lower() == 'y':
+            self.env_simulator.start_databases(fresh=self.fresh)
         
         # Main menu
         while True:
@@ -546,23 +754,17 @@ class ExamPracticeSystem:
             else:
                 print("Invalid choice!")
                 
-        # Cleanup
-        self.env_simulator.stop_databases()
+        # Cleanup (KEEP_CONTAINERS=1 leaves databases running for the next session)
+        if os.environ.get('KEEP_CONTAINERS') == '1':
+            print("ℹ️ Leaving databases running (KEEP_CONTAINERS=1)")
+        else:
+            self.env_simulator.stop_databases()
         print("\n👋 Goodbye!")
     
     def test_python(self):
         """Test Python code"""
         print("\n🐍 Python Code Test")
-        print("Enter your code (type 'END' to finish):")
-        
-        code_lines = []
-        while True:
-            line = input()
-            if line == "END":
-                break
-            code_lines.append(line)
-        
-        code = "\n".join(code_lines)
+        code = self._read_multiline("Enter your code (type 'END' to finish):", suffix=".py")
         
         # Expected output
         expected_output = input("\nExpected output (optional): ")
@@ -587,8 +789,7 @@ class ExamPracticeSystem:
             setup_queries.append(setup)
         
         # Main query
-        print("\nQuery to test:")
-        query = input("Neo4j query: ")
+        query = self._read_multiline("\nNeo4j query to test (type 'END' to finish):", suffix=".cypher")
         
         # Test
         result = self.code_tester.test_neo4j_query(query, setup_queries)
@@ -606,26 +807,26 @@ class ExamPracticeSystem:
         operation = input("\nOperation type (find/insert/update/delete): ")
         
         # Setup data
-        print("\nSetup data (in JSON format, optional, empty line to finish):")
+        setup_blob = self._read_multiline(
+            "\nSetup data (a JSON array or one JSON document per line, optional, type 'END' to finish):",
+            suffix=".json"
+        )
         setup_data = []
-        while True:
-            data_str = input("Data: ")
-            if not data_str:
-                break
-            try:
-                data = json.loads(data_str)
-                setup_data.append(data)
-            except json.JSONDecodeError:
-                print("Invalid JSON format!")
+        try:
+            if setup_blob.lstrip().startswith('['):
+                setup_data = _json_loads(setup_blob)
+            else:
+                setup_data = [_json_loads(line) for line in setup_blob.splitlines() if line.strip()]
+        except ValueError:
+            print("Invalid JSON format!")
         
         # Query data
-        print("\nQuery data (in JSON format):")
         query_data = {}
+        query_blob = self._read_multiline("\nQuery data (in JSON format, type 'END' to finish):", suffix=".json")
         try:
-            query_str = input("Query: ")
-            if query_str:
-                query_data = json.loads(query_str)
-        except json.JSONDecodeError:
+            if query_blob.strip():
+                query_data = _json_loads(query_blob)
+        except ValueError:
             print("Invalid JSON format!")
         
         # Test
@@ -636,6 +837,48 @@ class ExamPracticeSystem:
         # Display results
         self._display_result(result)
     
+    def _read_multiline(self, prompt: str, suffix: str = ".txt") -> str:
+        """
+        Read a multi-line block of text from the user.
+        
+        Opens $EDITOR on a temporary file when it is set and we are attached to a
+        terminal. Otherwise reads until a line equal to 'END'; when stdin is piped
+        (e.g. cat code.py | python moodle_exam_simulator.py) the block may also
+        simply run to end of input.
+        
+        Args:
+            prompt: Text shown before reading
+            suffix: Temp file suffix, so the editor picks the right syntax mode
+        """
+        editor = os.environ.get('EDITOR')
+        
+        if editor and sys.stdin.isatty():
+            with tempfile.NamedTemporaryFile('w', suffix=suffix, delete=False) as tmp:
+                path = tmp.name
+            try:
+                print(f"{prompt.strip()}\n(opening {editor}, save and close the file to continue)")
+                subprocess.call([*shlex.split(editor), path])
+                with open(path, encoding='utf-8') as f:
+                    return f.read().rstrip("\n")
+            finally:
+                os.unlink(path)
+        
+        print(prompt)
+        lines = []
+        if sys.stdin.isatty():
+            while True:
+                line = input()
+                if line == "END":
+                    break
+                lines.append(line)
+        else:
+            for line in sys.stdin:
+                line = line.rstrip("\n")
+                if line == "END":
+                    break
+                lines.append(line)
+        return "\n".join(lines)
+    
     def test_sql(self):
         """Test SQL query"""
         print("\n🗃️ SQL Query Test")
@@ -652,8 +895,7 @@ class ExamPracticeSystem:
             setup_queries.append(setup)
         
         # Main query
-        print("\nQuery to test:")
-        query = input("SQL query: ")
+        query = self._read_multiline("\nSQL query to test (type 'END' to finish):", suffix=".sql")
         
         # Test
         result = self.code_tester.test_sql_query(query, db_type, setup_queries)
@@ -767,37 +1009,60 @@ def install_requirements(only_missing: bool = True) -> None:
     }
     
     print("📦 Checking required libraries...")
+    to_install = []
     for req, description in requirements.items():
-        try:
-            if only_missing:
+        if only_missing:
+            try:
                 # Check if the package is already installed
                 importlib.import_module(req.split('-')[0])  # Handle packages with hyphens
                 print(f"✓ {req} is already installed")
                 continue
-            
-            print(f"Installing {req} ({description})...")
-            subprocess.run(
-                [sys.executable, "-m", "pip", "install", req],
-                capture_output=True,
-                check=True
-            )
+            except ImportError:
+                pass
+            except Exception as e:
+                print(f"⚠️ Error with {req}: {e}")
+                continue
+
+        print(f"Installing {req} ({description})...")
+        to_install.append(req)
+
+    if not to_install:
+        return
+
+    def pip_install(*packages):
+        return subprocess.run(
+            [sys.executable, "-m", "pip", "install",
+             "--disable-pip-version-check", "--no-input", "--prefer-binary",
+             *packages],
+            capture_output=True,
+            text=True,
+            check=False
+        )
+
+    # A single pip invocation resolves all packages together instead of
+    # paying pip's startup and index resolution once per package
+    if pip_install(*to_install).returncode == 0:
+        for req in to_install:
             print(f"✓ {req} installed successfully")
-        except ImportError:
-            # Package is not installed
-            print(f"Installing {req} ({description})...")
-            try:
-                subprocess.run(
-                    [sys.executable, "-m", "pip", "install", req],
-                    capture_output=True,
-                    check=True
-                )
-                print(f"✓ {req} installed successfully")
-            except subprocess.CalledProcessError as e:
-                print(f"⚠️ Failed to install {req}: {e}")
-        except Exception as e:
-            print(f"⚠️ Error with {req}: {e}")
+        return
+
+    # One bad package fails the whole batch; retry each on its own so the
+    # rest still install and failures are attributed to the right package
+    for req in to_install:
+        process = pip_install(req)
+        if process.returncode == 0:
+            print(f"✓ {req} installed successfully")
+        else:
+            print(f"⚠️ Failed to install {req}: pip exited with status {process.returncode}")
 
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Moodle Exam Simulator")
+    parser.add_argument("--fresh", action="store_true",
+                        help="Remove existing exam containers and start new ones")
+    args = parser.parse_args()
+    
     print("📣 Moodle Exam Simulator")
     print("=======================\n")
     
@@ -805,7 +1070,7 @@ if __name__ == "__main__":
     docker_available = False
     try:
         # Try to import the Docker module only when needed
-        docker = importlib.import_module('docker')
+        docker = _lazy_import('docker')
         docker_client = docker.from_env()
         docker_client.ping()
         docker_available = True
@@ -819,7 +1084,7 @@ if __name__ == "__main__":
     
     # Start the system with enhanced error handling
     try:
-        system = ExamPracticeSystem()
+        system = ExamPracticeSystem(fresh=args.fresh)
         system.start()
     except KeyboardInterrupt:
         print("\n✔️ Program terminated by user")
@@ -14,34 +14,136 @@ import time
 import socket
 import logging
 import argparse
+import functools
+import importlib
 import subprocess
-import json
-import urllib.request
+from collections import ChainMap
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 
-# Setup logging
+# Setup logging (main() adds a file handler when --log-file is given)
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('test_runner.log')
-    ]
+    format=LOG_FORMAT,
+    handlers=[logging.StreamHandler()]
 )
 logger = logging.getLogger('test_runner')
 
-def setup_test_environment():
-    """Set up the test environment with necessary variables."""
-    # Load from .env file if it exists
+# Prefer orjson for the JSON report; it serializes straight to bytes
+try:
+    import orjson
+    
+    def _dump_json(data):
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+except ImportError:
+    import json
+    
+    def _dump_json(data):
+        return json.dumps(data, indent=2).encode()
+
+@functools.lru_cache(maxsize=1)
+def _load_dotenv_file():
+    """Parse the .env next to this script once per process; None means python-dotenv isn't installed."""
     try:
-        from dotenv import load_dotenv
-        load_dotenv()
-        logger.info("Loaded environment variables from .env file")
+        dotenv = importlib.import_module('dotenv')
     except ImportError:
-        logger.warning("python-dotenv not installed, skipping .env file loading")
+        return None
+    return dotenv.dotenv_values(Path(__file__).with_name('.env')) or {}
+
+# One row of the HTML report's summary table
+ROW_TMPL = """            <tr>
+                <td>{name}</td>
+                <td class="{cls}">
+                    {label}
+                </td>
+                <td>{dur:.2f}</td>
+            </tr>
+"""
+
+# One output file link in the HTML report's details section
+LINK_TMPL = """            <li><a href="{href}">{name} Output</a></li>
+"""
+
+# test_api.py's in-memory SQLite database belongs to the process that opened
+# it, so each xdist worker seeds and queries its own copy
+UNIT_TEST_PATHS = [
+    "tests/test_api.py",
+    "tests/test_db_manager.py",
+    "tests/test_health_api.py",
+    "tests/test_retry_manager.py",
+]
+PERFORMANCE_TEST_PATHS = ["tests/performance/test_performance.py"]
+
+# Full HTML report; filled in by generate_report with str.format_map
+_HTML_TMPL = """<!DOCTYPE html>
+<html>
+<head>
+    <title>MoodleExamSimulator Test Report</title>
+    <style>
+        body {{ font-family: Arial, sans-serif; margin: 20px; }}
+        h1, h2 {{ color: #333; }}
+        .success {{ color: green; }}
+        .failure {{ color: red; }}
+        .section {{ margin-bottom: 20px; padding: 10px; border: 1px solid #ddd; }}
+        table {{ border-collapse: collapse; width: 100%; }}
+        th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
+        th {{ background-color: #f2f2f2; }}
+    </style>
+</head>
+<body>
+    <h1>MoodleExamSimulator Test Report</h1>
+    <p>Generated: {generated}</p>
     
-    test_env = os.environ.copy()
+    <div class="section">
+        <h2>Summary</h2>
+        <p>Overall Status: <span class="{overall_cls}">
+            {overall_label}
+        </span></p>
+        <table>
+            <tr>
+                <th>Test Type</th>
+                <th>Status</th>
+                <th>Duration (s)</th>
+            </tr>
+{rows}        </table>
+    </div>
+    
+    <div class="section">
+        <h2>Details</h2>
+        <p>See the output files for detailed test results:</p>
+        <ul>
+{links}        </ul>
+    </div>
+</body>
+</html>
+"""
+
+# Generated or third-party directories the linter never needs to walk
+LINT_EXCLUDES = ("venv", "__pycache__", ".git", "node_modules", "test_results")
+
+# Stages shown in the HTML report, in display order
+REPORT_STAGES = (
+    ("unit_tests", "Unit Tests"),
+    ("performance_tests", "Performance Tests"),
+    ("linting", "Linting"),
+)
+
+def setup_test_environment():
+    """Set up the test environment with necessary variables."""
+    # Overrides go in the front map; os.environ is only read through
+    test_env = ChainMap({}, os.environ)
+    
+    # Apply the .env file (parsed on first use), without overriding the real environment
+    dotenv_values = _load_dotenv_file()
+    if dotenv_values is None:
+        logger.warning("python-dotenv not installed, skipping .env file loading")
+    else:
+        for key, value in dotenv_values.items():
+            if value is not None and key not in test_env:
+                test_env[key] = value
+        logger.info("Loaded environment variables from .env file")
     
     # Define default test-specific environment variables
     default_env = {
@@ -76,29 +178,89 @@ def setup_test_environment():
     
     # Only update with defaults if not already present in environment
     for key, value in default_env.items():
-        if key not in test_env or not test_env[key]:
+        if not test_env.get(key):
             test_env[key] = value
     
-    return test_env
+    # subprocess needs a real mapping, so materialize it once here
+    return dict(test_env)
 
-def check_service_availability(services=None):
+def _probe(name, host, port, timeout=0.5):
+    """Try a TCP connection to a service.
+    
+    Returns:
+        tuple: (name, True if the port accepted the connection)
+    """
+    logger.info(f"Checking if {name} is available at {host}:{port}...")
+    try:
+        try:
+            socket.create_connection((host, port), timeout=timeout).close()
+            available = True
+        except OSError:
+            available = False
+        
+        if available:
+            logger.info(f"✅ {name} is available")
+        else:
+            logger.warning(f"❌ {name} is not available")
+        return name, available
+    except Exception as e:
+        logger.error(f"Error checking {name}: {e}")
+        return name, False
+
+@functools.lru_cache(maxsize=64)
+def _resolve(domain):
+    """Resolve a hostname, caching the answer for the rest of the process."""
+    return socket.getaddrinfo(domain, None, type=socket.SOCK_STREAM)
+
+def _probe_supabase(url):
+    """Check that the Supabase domain resolves.
+    
+    Returns:
+        tuple: ('supabase', True if the hostname resolved)
+    """
+    from urllib.parse import urlparse
+    
+    try:
+        # Just try to connect to the domain, don't make an actual API call
+        parsed_url = urlparse(url)
+        domain = parsed_url.hostname
+        
+        # Try to resolve the hostname
+        _resolve(domain)
+        logger.info("✅ Supabase domain is resolvable")
+        return 'supabase', True
+    except Exception as e:
+        logger.warning(f"❌ Supabase is not accessible: {e}")
+        return 'supabase', False
+
+def check_service_availability(services=None, env=None):
     """Check if the required services are available before running tests.
     
+    The probes run concurrently, so the check takes as long as the slowest
+    service rather than the sum of all timeouts.
+    
     Args:
         services: List of services to check, or None to check all
+        env: Environment to read service settings from (defaults to os.environ)
         
     Returns:
         dict: Status of each service (True if available, False otherwise)
     """
+    if env is None:
+        env = os.environ
+    
     all_services = {
-        'mongodb': {'host': os.environ.get('MONGO_HOST', 'localhost'), 
-                  'port': int(os.environ.get('MONGO_PORT', 27017))},
-        'mysql': {'host': os.environ.get('MYSQL_HOST', 'localhost'), 
-                 'port': int(os.environ.get('MYSQL_PORT', 3306))},
-        'neo4j': {'host': os.environ.get('NEO4J_HOST', 'localhost'), 
-                 'port': int(os.environ.get('NEO4J_PORT', 7687))},
+        'mongodb': {'host': env.get('MONGO_HOST', 'localhost'), 
+                  'port': int(env.get('MONGO_PORT', 27017))},
+        'mysql': {'host': env.get('MYSQL_HOST', 'localhost'), 
+                 'port': int(env.get('MYSQL_PORT', 3306))},
+        'neo4j': {'host': env.get('NEO4J_HOST', 'localhost'), 
+                 'port': int(env.get('NEO4J_PORT', 7687))},
     }
     
+    # Local services answer in well under a second; only the failure path waits
+    timeout = float(env.get('SERVICE_PROBE_TIMEOUT', '0.5'))
+    
     # If no specific services specified, check all
     if services is None:
         services = list(all_services.keys())
@@ -106,148 +268,183 @@ def check_service_availability(services=None):
     # Filter only requested services
     check_services = {k: v for k, v in all_services.items() if k in services}
     
+    # Check if Supabase is accessible if URL is provided
+    supabase_url = env.get('SUPABASE_URL') if 'supabase' in services else None
+    
+    probe_count = len(check_services) + (1 if supabase_url else 0)
+    if not probe_count:
+        return {}
+    
     results = {}
-    for service_name, config in check_services.items():
-        logger.info(f"Checking if {service_name} is available at {config['host']}:{config['port']}...")
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(2)  # 2 second timeout
-            result = sock.connect_ex((config['host'], config['port']))
-            sock.close()
-            
-            available = (result == 0)
+    with ThreadPoolExecutor(max_workers=probe_count) as executor:
+        futures = [
+            executor.submit(_probe, service_name, config['host'], config['port'], timeout)
+            for service_name, config in check_services.items()
+        ]
+        if supabase_url:
+            futures.append(executor.submit(_probe_supabase, supabase_url))
+        
+        for future in as_completed(futures):
+            service_name, available = future.result()
             results[service_name] = available
-            if available:
-                logger.info(f"✅ {service_name} is available")
-            else:
-                logger.warning(f"❌ {service_name} is not available")
-        except Exception as e:
-            logger.error(f"Error checking {service_name}: {e}")
-            results[service_name] = False
     
-    # Check if Supabase is accessible if URL is provided
-    if 'supabase' in services and os.environ.get('SUPABASE_URL'):
-        try:
-            # Just try to connect to the domain, don't make an actual API call
-            url = os.environ.get('SUPABASE_URL')
-            parsed_url = urllib.parse.urlparse(url)
-            domain = parsed_url.netloc
-            
-            # Try to resolve the hostname
-            socket.gethostbyname(domain)
-            logger.info("✅ Supabase domain is resolvable")
-            results['supabase'] = True
-        except Exception as e:
-            logger.warning(f"❌ Supabase is not accessible: {e}")
-            results['supabase'] = False
-    
-    return results
+    # Report in the order the services were requested, not completion order
+    order = [*check_services, 'supabase']
+    return {name: results[name] for name in order if name in results}
+
+def _xdist_args():
+    """Shard across pytest-xdist workers, leaving a couple of cores free.
+    
+    loadfile keeps each test file (and its module fixtures) on one worker.
+    """
+    return ["-n", str(max(1, (os.cpu_count() or 1) - 2)), "--dist=loadfile"]
 
-def run_unit_tests(test_env, output_dir, verbose=False):
-    """Run unit tests using pytest."""
+def _coverage_setup(test_env, output_dir, coverage=True):
+    """Return the (env, pytest args) pair for collecting coverage.
+    
+    Coverage data and reports are kept in their own directory so they don't
+    land in the tree while the other stages are running. With coverage
+    disabled the environment is returned unchanged and no args are added.
+    """
+    if not coverage:
+        return test_env, []
+    
+    coverage_dir = output_dir / "coverage"
+    coverage_dir.mkdir(exist_ok=True)
+    env = dict(test_env, COVERAGE_FILE=str(coverage_dir / ".coverage"))
+    args = [
+        "--cov=.",
+        f"--cov-report=xml:{coverage_dir / 'coverage.xml'}",
+        f"--cov-report=html:{coverage_dir / 'html'}"
+    ]
+    return env, args
+
+def run_unit_tests(test_env, output_dir, verbose=False, coverage=True):
+    """Run unit tests using pytest.
+    
+    Args:
+        test_env: Environment for the pytest process
+        output_dir: Resolved Path of the results directory
+        verbose: Whether to run pytest verbosely
+        coverage: Whether to collect coverage
+    """
     print("Running unit tests...")
+    unit_env, coverage_args = _coverage_setup(test_env, output_dir, coverage)
+    junit_xml = str(output_dir / "unit_tests.xml")
+    output_file = str(output_dir / "unit_tests_output.txt")
     
     # Create command
     cmd = [
         "python", "-m", "pytest",
-        "tests/test_db_manager.py",
-        "tests/test_health_api.py",
-        "tests/test_retry_manager.py",
+        *UNIT_TEST_PATHS,
         "-v" if verbose else "-q",
-        f"--junitxml={output_dir}/unit_tests.xml",
-        "--cov=.",
-        f"--cov-report=xml:{output_dir}/coverage.xml",
-        f"--cov-report=html:{output_dir}/coverage_html"
+        *_xdist_args(),
+        f"--junitxml={junit_xml}",
+        *coverage_args
     ]
     
-    # Run the tests
+    # Run the tests, streaming their output straight to the output file
     start_time = time.time()
-    result = subprocess.run(cmd, env=test_env, capture_output=True, text=True)
+    with open(output_file, "wb") as f:
+        result = subprocess.run(cmd, env=unit_env, stdout=f, stderr=subprocess.STDOUT)
     duration = time.time() - start_time
     
-    # Save output
-    with open(f"{output_dir}/unit_tests_output.txt", "w") as f:
-        f.write(result.stdout)
-        if result.stderr:
-            f.write("\n\nERRORS:\n")
-            f.write(result.stderr)
-    
     return {
         "success": result.returncode == 0,
         "duration": duration,
-        "output_file": f"{output_dir}/unit_tests_output.txt",
-        "returncode": result.returncode
+        "output_file": output_file,
+        "returncode": result.returncode,
+        "coverage": coverage
     }
 
 def run_performance_tests(test_env, output_dir, verbose=False):
-    """Run performance tests."""
+    """Run performance tests.
+    
+    Args:
+        test_env: Environment for the pytest process
+        output_dir: Resolved Path of the results directory
+        verbose: Whether to run pytest verbosely
+    """
     print("Running performance tests...")
+    junit_xml = str(output_dir / "performance_tests.xml")
+    output_file = str(output_dir / "performance_tests_output.txt")
     
     # Create command
     cmd = [
         "python", "-m", "pytest",
-        "tests/performance/test_performance.py",
+        *PERFORMANCE_TEST_PATHS,
         "-v" if verbose else "-q",
-        f"--junitxml={output_dir}/performance_tests.xml"
+        f"--junitxml={junit_xml}"
     ]
     
-    # Run the tests
+    # Run the tests, streaming their output straight to the output file
     start_time = time.time()
-    result = subprocess.run(cmd, env=test_env, capture_output=True, text=True)
+    with open(output_file, "wb") as f:
+        result = subprocess.run(cmd, env=test_env, stdout=f, stderr=subprocess.STDOUT)
     duration = time.time() - start_time
     
-    # Save output
-    with open(f"{output_dir}/performance_tests_output.txt", "w") as f:
-        f.write(result.stdout)
-        if result.stderr:
-            f.write("\n\nERRORS:\n")
-            f.write(result.stderr)
-    
     return {
         "success": result.returncode == 0,
         "duration": duration,
-        "output_file": f"{output_dir}/performance_tests_output.txt",
+        "output_file": output_file,
         "returncode": result.returncode
     }
 
 def run_linting(output_dir):
-    """Run code linting with flake8."""
+    """Run code linting with ruff."""
     print("Running code linting...")
     
-    # Create command
+    # Leave out generated directories, including this run's output dir, on
+    # top of ruff's defaults (.venv, build, dist, site-packages, ...)
+    excludes = ",".join((*LINT_EXCLUDES, str(output_dir)))
+    
+    # Create command; lint the project directory wherever we're run from
     cmd = [
-        "flake8",
-        "--max-line-length=100",
-        "--exclude=venv,__pycache__,.git,*.pyc",
-        "."
+        "ruff", "check",
+        "--line-length=100",
+        f"--extend-exclude={excludes}",
+        "--respect-gitignore",
+        str(Path(__file__).resolve().parent)
     ]
     
-    # Run the linting
+    # Run the linting, streaming its output straight to the output file
+    output_file = output_dir / "linting_output.txt"
     start_time = time.time()
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    with open(output_file, "wb") as f:
+        # Config and CLI errors only show up on stderr, so keep it in the report
+        result = subprocess.run(cmd, stdout=f, stderr=subprocess.STDOUT)
+        silent = f.tell() == 0
     duration = time.time() - start_time
     
-    # Save output
-    with open(f"{output_dir}/linting_output.txt", "w") as f:
-        if result.stdout:
-            f.write(result.stdout)
-        else:
-            f.write("No linting issues found.")
-        if result.stderr:
-            f.write("\n\nERRORS:\n")
-            f.write(result.stderr)
+    if result.returncode == 0 and silent:
+        output_file.write_text("No linting issues found.")
     
     return {
         "success": result.returncode == 0,
         "duration": duration,
-        "output_file": f"{output_dir}/linting_output.txt",
+        "output_file": str(output_file),
         "returncode": result.returncode
     }
 
+def _cell(ok):
+    """Return the (CSS class, label) pair for a pass/fail status."""
+    return ('success', 'PASSED') if ok else ('failure', 'FAILED')
+
 def generate_report(results, output_dir, service_status=None):
     """Generate a comprehensive test report."""
     print("Generating test report...")
     
+    # Read the clock once so the JSON and HTML timestamps agree
+    now = datetime.now()
+    iso = now.isoformat()
+    human = now.strftime('%Y-%m-%d %H:%M:%S')
+    
+    # Look up each report stage's status and duration once
+    rows = [
+        (stage, name, results[stage].get("success", False), results[stage].get("duration", 0.0))
+        for stage, name in REPORT_STAGES
+    ]
+    
     # Create report data
     summary = {}
     
@@ -259,13 +456,15 @@ def generate_report(results, output_dir, service_status=None):
         }
     
     # Add test results to summary
-    for test_type, result in results.items():
-        if isinstance(result, dict) and "success" in result:
-            summary[test_type] = result["success"]
+    test_results = {
+        test_type: result["success"]
+        for test_type, result in results.items()
+        if isinstance(result, dict) and "success" in result
+    }
+    summary.update(test_results)
     
     # Calculate overall success
-    test_results = [r["success"] for r in results.values() if isinstance(r, dict) and "success" in r]
-    overall_success = all(test_results) if test_results else False
+    overall_success = all(test_results.values()) if test_results else False
     
     # If services are checked and unavailable, note that in the report
     if service_status and not all(service_status.values()):
@@ -275,89 +474,40 @@ def generate_report(results, output_dir, service_status=None):
     summary["overall_success"] = overall_success
     
     report = {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": iso,
         "summary": summary,
         "details": results
     }
     
     # Save report as JSON
-    with open(f"{output_dir}/test_report.json", "w") as f:
-        json.dump(report, f, indent=2)
+    (output_dir / "test_report.json").write_bytes(_dump_json(report))
     
     # Generate HTML report
-    html_report = f"""<!DOCTYPE html>
-<html>
-<head>
-    <title>MoodleExamSimulator Test Report</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 20px; }}
-        h1, h2 {{ color: #333; }}
-        .success {{ color: green; }}
-        .failure {{ color: red; }}
-        .section {{ margin-bottom: 20px; padding: 10px; border: 1px solid #ddd; }}
-        table {{ border-collapse: collapse; width: 100%; }}
-        th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-        th {{ background-color: #f2f2f2; }}
-    </style>
-</head>
-<body>
-    <h1>MoodleExamSimulator Test Report</h1>
-    <p>Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-    
-    <div class="section">
-        <h2>Summary</h2>
-        <p>Overall Status: <span class="{'success' if report['summary']['overall_success'] else 'failure'}">
-            {'PASSED' if report['summary']['overall_success'] else 'FAILED'}
-        </span></p>
-        <table>
-            <tr>
-                <th>Test Type</th>
-                <th>Status</th>
-                <th>Duration (s)</th>
-            </tr>
-            <tr>
-                <td>Unit Tests</td>
-                <td class="{'success' if results['unit_tests']['success'] else 'failure'}">
-                    {'PASSED' if results['unit_tests']['success'] else 'FAILED'}
-                </td>
-                <td>{results['unit_tests']['duration']:.2f}</td>
-            </tr>
-            <tr>
-                <td>Performance Tests</td>
-                <td class="{'success' if results['performance_tests']['success'] else 'failure'}">
-                    {'PASSED' if results['performance_tests']['success'] else 'FAILED'}
-                </td>
-                <td>{results['performance_tests']['duration']:.2f}</td>
-            </tr>
-            <tr>
-                <td>Linting</td>
-                <td class="{'success' if results['linting']['success'] else 'failure'}">
-                    {'PASSED' if results['linting']['success'] else 'FAILED'}
-                </td>
-                <td>{results['linting']['duration']:.2f}</td>
-            </tr>
-        </table>
-    </div>
-    
-    <div class="section">
-        <h2>Details</h2>
-        <p>See the output files for detailed test results:</p>
-        <ul>
-            <li><a href="unit_tests_output.txt">Unit Tests Output</a></li>
-            <li><a href="performance_tests_output.txt">Performance Tests Output</a></li>
-            <li><a href="linting_output.txt">Linting Output</a></li>
-            <li><a href="coverage_html/index.html">Coverage Report</a></li>
-        </ul>
-    </div>
-</body>
-</html>
-    """
+    overall_cls, overall_label = _cell(overall_success)
+    row_html = []
+    for stage, name, ok, duration in rows:
+        cls, label = _cell(ok)
+        row_html.append(ROW_TMPL.format(name=name, cls=cls, label=label, dur=duration))
+    links = "".join(
+        LINK_TMPL.format(href=Path(results[stage]['output_file']).name, name=name)
+        for stage, name in REPORT_STAGES
+        if 'output_file' in results[stage]
+    )
+    if any(results[stage].get('coverage') for stage, _ in REPORT_STAGES):
+        links += '            <li><a href="coverage/html/index.html">Coverage Report</a></li>\n'
+    html_report = _HTML_TMPL.format_map({
+        "generated": human,
+        "overall_cls": overall_cls,
+        "overall_label": overall_label,
+        "rows": "".join(row_html),
+        "links": links,
+    })
     
     # Save HTML report
-    with open(f"{output_dir}/test_report.html", "w") as f:
-        f.write(html_report)
+    html_path = output_dir / "test_report.html"
+    html_path.write_text(html_report)
     
-    print(f"Test report generated at {output_dir}/test_report.html")
+    print(f"Test report generated at {html_path}")
     
     return report
 
@@ -374,11 +524,20 @@ def main():
                         help="Specific services to check availability for")
     parser.add_argument("--continue-on-service-unavailable", action="store_true", 
                         help="Continue even if services are unavailable")
+    parser.add_argument("--skip-coverage", action="store_true",
+                        help="Run unit tests without coverage collection")
+    parser.add_argument("--log-file", nargs="?", const="test_runner.log",
+                        help="Also write the runner log to a file (default: test_runner.log)")
     args = parser.parse_args()
     
+    if args.log_file:
+        file_handler = logging.FileHandler(args.log_file)
+        file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        logging.getLogger().addHandler(file_handler)
+    
     # Create output directory
-    output_dir = args.output_dir
-    os.makedirs(output_dir, exist_ok=True)
+    output_dir = Path(args.output_dir).resolve()
+    output_dir.mkdir(parents=True, exist_ok=True)
     
     # Set up test environment
     test_env = setup_test_environment()
@@ -386,7 +545,7 @@ def main():
     # Check services availability
     service_status = {}
     if not args.skip_service_check:
-        service_status = check_service_availability(args.services)
+        service_status = check_service_availability(args.services, test_env)
         all_available = all(service_status.values())
         if not all_available and not args.continue_on_service_unavailable:
             logger.error("Some required services are not available. Use --continue-on-service-unavailable to force test execution.")
@@ -397,24 +556,34 @@ def main():
     # Initialize results
     results = {"service_check": {"success": all(service_status.values()) if service_status else True}}
     
-    # Run tests
-    if not args.skip_unit:
-        results["unit_tests"] = run_unit_tests(test_env, output_dir, args.verbose)
-    else:
-        print("Skipping unit tests...")
-        results["unit_tests"] = {"success": True, "duration": 0, "skipped": True}
-    
-    if not args.skip_performance:
-        results["performance_tests"] = run_performance_tests(test_env, output_dir, args.verbose)
-    else:
-        print("Skipping performance tests...")
-        results["performance_tests"] = {"success": True, "duration": 0, "skipped": True}
-    
-    if not args.skip_linting:
-        results["linting"] = run_linting(output_dir)
-    else:
-        print("Skipping linting...")
-        results["linting"] = {"success": True, "duration": 0, "skipped": True}
+    # Run tests. Each stage is an independent child process writing its own
+    # output files, so they run side by side and the total wall time is that
+    # of the slowest stage.
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = {}
+        if not args.skip_unit:
+            futures["unit_tests"] = executor.submit(run_unit_tests, test_env, output_dir, args.verbose,
+                                                    not args.skip_coverage)
+        else:
+            print("Skipping unit tests...")
+        
+        if not args.skip_performance:
+            futures["performance_tests"] = executor.submit(run_performance_tests, test_env, output_dir, args.verbose)
+        else:
+            print("Skipping performance tests...")
+        
+        if not args.skip_linting:
+            futures["linting"] = executor.submit(run_linting, output_dir)
+        else:
+            print("Skipping linting...")
+        
+        stage_results = {stage: future.result() for stage, future in futures.items()}
+        
+        for stage in ("unit_tests", "performance_tests", "linting"):
+            if stage in stage_results:
+                results[stage] = stage_results[stage]
+            else:
+                results[stage] = {"success": True, "duration": 0, "skipped": True}
     
     # Generate report
     report = generate_report(results, output_dir, service_status)
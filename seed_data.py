@@ -5,219 +5,152 @@ This script populates the database with sample challenges, resources, and users
 
 import os
 import sys
+import csv
+import io
 import datetime
 import json
-from werkzeug.security import generate_password_hash
 
 # Add the project directory to the path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-# Import the app and models
-from web_api import app
-from models import db, User, Challenge, UserChallenge, Resource
+# Seed users, challenges and resources live in this JSON file next to the script
+SEED_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "seed_data.json")
+
+def load_seed_data(path: str = SEED_DATA_PATH) -> dict:
+    """Load the seed data, serializing each challenge's test cases for storage"""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    for challenge in data["challenges"]:
+        if challenge["test_cases"] is not None:
+            challenge["test_cases"] = json.dumps(challenge["test_cases"])
+    return data
+
+def _copy_sql(dialect, model, columns):
+    """Build the COPY statement for a model, quoting the table and column names"""
+    preparer = dialect.identifier_preparer
+    quoted_columns = ", ".join(preparer.quote(column) for column in columns)
+    return f"COPY {preparer.format_table(model.__table__)} ({quoted_columns}) FROM STDIN WITH (FORMAT CSV)"
+
+def _bulk_insert(session, model, rows):
+    """Insert rows with COPY on PostgreSQL, or bulk_insert_mappings elsewhere"""
+    if not rows:
+        return
+    if session.bind.dialect.name != "postgresql":
+        # Plain mappings skip the per-object unit-of-work bookkeeping
+        session.bulk_insert_mappings(model, rows)
+        return
+    
+    # COPY skips PostgreSQL's per-statement parse/plan; empty CSV fields load as NULL
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([row[column] for column in columns] for row in rows)
+    buffer.seek(0)
+    
+    # Names like "user" are reserved in PostgreSQL, so they must be quoted
+    copy_sql = _copy_sql(session.bind.dialect, model, columns)
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(copy_sql, buffer)
+    finally:
+        cursor.close()
 
 def seed_database():
     """Seed the database with sample data"""
+    # Deployments that never want sample data can skip the whole step
+    if os.environ.get("SEED_SKIP") == "1":
+        print("SEED_SKIP=1, skipping database seeding")
+        return
+    
+    seed = load_seed_data()
+    users_seed = seed["users"]
+    challenges_seed = seed["challenges"]
+    resources_seed = seed["resources"]
+    
+    # Imported here so loading this module doesn't pull in the web app
+    from werkzeug.security import generate_password_hash
+    from web_api import app
+    from models import db, User, Challenge, Resource
+
     with app.app_context():
         print("Seeding database...")
         
-        # Create sample users
-        users = [
-            {
-                "username": "john_doe",
-                "email": "john@example.com",
-                "password": "password123",
-                "points": 2450,
-                "streak": 7
-            },
-            {
-                "username": "emma_smith",
-                "email": "emma@example.com",
-                "password": "password123",
-                "points": 2280,
-                "streak": 5
-            },
-            {
-                "username": "michael_brown",
-                "email": "michael@example.com",
-                "password": "password123",
-                "points": 2100,
-                "streak": 3
-            },
-            {
-                "username": "sarah_jones",
-                "email": "sarah@example.com",
-                "password": "password123",
-                "points": 1950,
-                "streak": 4
-            },
-            {
-                "username": "david_wilson",
-                "email": "david@example.com",
-                "password": "password123",
-                "points": 1800,
-                "streak": 2
-            }
-        ]
-        
-        for user_data in users:
-            # Check if user already exists
-            existing_user = User.query.filter_by(username=user_data["username"]).first()
-            if existing_user:
-                print(f"User {user_data['username']} already exists, skipping...")
-                continue
-                
-            user = User(
-                username=user_data["username"],
-                email=user_data["email"],
-                points=user_data["points"],
-                streak=user_data["streak"]
-            )
-            user.password_hash = generate_password_hash(user_data["password"])
-            user.created_at = datetime.datetime.utcnow()
-            user.last_activity = datetime.datetime.utcnow()
-            db.session.add(user)
-        
-        # Create sample challenges
-        challenges = [
-            {
-                "title": "Python: Fibonacci Sequence",
-                "description": "Write a function that returns the nth Fibonacci number. The Fibonacci sequence starts with 0 and 1, and each subsequent number is the sum of the two preceding ones.",
-                "difficulty": "Easy",
-                "language": "python",
-                "points": 100,
-                "initial_code": "def fibonacci(n):\n    # Your code here\n    pass\n\n# Example usage:\n# fibonacci(6) should return 8",
-                "expected_output": "8",
-                "test_cases": json.dumps([
-                    {"input": "fibonacci(0)", "expected": "0"},
-                    {"input": "fibonacci(1)", "expected": "1"},
-                    {"input": "fibonacci(6)", "expected": "8"},
-                    {"input": "fibonacci(10)", "expected": "55"}
-                ])
-            },
-            {
-                "title": "Neo4j: Social Network Analysis",
-                "description": "Write a Cypher query to find the 5 people with the most connections in a social network graph.",
-                "difficulty": "Medium",
-                "language": "neo4j",
-                "points": 200,
-                "initial_code": "// Your Cypher query here\n// Example data model: (Person)-[:FOLLOWS]->(Person)",
-                "expected_output": None,
-                "test_cases": None
-            },
-            {
-                "title": "MongoDB: Aggregation Pipeline",
-                "description": "Write a MongoDB aggregation pipeline to group products by category and calculate the total sales for each category.",
-                "difficulty": "Hard",
-                "language": "mongodb",
-                "points": 300,
-                "initial_code": "// Your MongoDB aggregation pipeline\n// Example collection: products with fields: name, category, price, quantity_sold",
-                "expected_output": None,
-                "test_cases": None
-            },
-            {
-                "title": "SQL: JOIN Operations",
-                "description": "Write a SQL query to join the 'orders', 'customers', and 'products' tables to find the top 5 customers by total order value.",
-                "difficulty": "Medium",
-                "language": "sql",
-                "points": 250,
-                "initial_code": "-- Your SQL query here\n-- Tables: orders(id, customer_id, product_id, quantity, order_date)\n--         customers(id, name, email, country)\n--         products(id, name, price, category)",
-                "expected_output": None,
-                "test_cases": None
-            },
-            {
-                "title": "Python: Palindrome Checker",
-                "description": "Write a function that checks if a given string is a palindrome (reads the same forwards and backwards), ignoring spaces, punctuation, and case.",
-                "difficulty": "Easy",
-                "language": "python",
-                "points": 150,
-                "initial_code": "def is_palindrome(text):\n    # Your code here\n    pass\n\n# Example usage:\n# is_palindrome('A man, a plan, a canal: Panama') should return True",
-                "expected_output": "True",
-                "test_cases": json.dumps([
-                    {"input": "is_palindrome('racecar')", "expected": "True"},
-                    {"input": "is_palindrome('hello')", "expected": "False"},
-                    {"input": "is_palindrome('A man, a plan, a canal: Panama')", "expected": "True"},
-                    {"input": "is_palindrome('Was it a car or a cat I saw?')", "expected": "True"}
-                ])
-            }
-        ]
-        
-        for challenge_data in challenges:
-            # Check if challenge already exists
-            existing_challenge = Challenge.query.filter_by(title=challenge_data["title"]).first()
-            if existing_challenge:
-                print(f"Challenge '{challenge_data['title']}' already exists, skipping...")
-                continue
-                
-            challenge = Challenge(
-                title=challenge_data["title"],
-                description=challenge_data["description"],
-                difficulty=challenge_data["difficulty"],
-                language=challenge_data["language"],
-                points=challenge_data["points"],
-                initial_code=challenge_data["initial_code"],
-                expected_output=challenge_data["expected_output"],
-                test_cases=challenge_data["test_cases"]
-            )
-            db.session.add(challenge)
-        
-        # Create sample resources
-        resources = [
-            {
-                "title": "Python Programming Guide",
-                "description": "Comprehensive guide to Python programming with examples and exercises.",
-                "category": "Lecture Notes",
-                "url": "https://docs.python.org/3/tutorial/"
-            },
-            {
-                "title": "SQL Cheat Sheet",
-                "description": "Quick reference for common SQL commands and syntax.",
-                "category": "Cheat Sheets",
-                "url": "https://www.sqltutorial.org/sql-cheat-sheet/"
-            },
-            {
-                "title": "MongoDB Documentation",
-                "description": "Official MongoDB documentation with tutorials and reference guides.",
-                "category": "Documentation",
-                "url": "https://docs.mongodb.com/"
-            },
-            {
-                "title": "Neo4j Cypher Query Language",
-                "description": "Guide to Neo4j's Cypher query language with examples.",
-                "category": "Documentation",
-                "url": "https://neo4j.com/developer/cypher/"
-            },
-            {
-                "title": "Database Design Principles",
-                "description": "Lecture notes on database design principles and best practices.",
-                "category": "Lecture Notes",
-                "url": "#"
-            },
-            {
-                "title": "Previous Year Exam Questions",
-                "description": "Collection of exam questions from previous years with solutions.",
-                "category": "Past Exams",
-                "url": "#"
-            }
-        ]
+        now = datetime.datetime.utcnow()
         
-        for resource_data in resources:
-            # Check if resource already exists
-            existing_resource = Resource.query.filter_by(title=resource_data["title"]).first()
-            if existing_resource:
-                print(f"Resource '{resource_data['title']}' already exists, skipping...")
-                continue
-                
-            resource = Resource(
-                title=resource_data["title"],
-                description=resource_data["description"],
-                category=resource_data["category"],
-                url=resource_data["url"]
-            )
-            db.session.add(resource)
+        # Run the duplicate checks and the inserts in one explicit transaction,
+        # nested in a savepoint if the session already has one open
+        in_outer_transaction = db.session().in_transaction()
+        transaction = db.session.begin_nested() if in_outer_transaction else db.session.begin()
+        with transaction:
+            # On PostgreSQL, take one snapshot for the duplicate checks and the
+            # inserts. The level can only be chosen before the transaction's
+            # first statement, so a savepoint keeps the outer transaction's level
+            if not in_outer_transaction and db.engine.dialect.name == "postgresql":
+                db.session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+            
+            # One IN query per table finds the seed rows that already exist;
+            # nothing is pending yet, so skip the autoflush before each query
+            with db.session.no_autoflush:
+                existing_usernames = {
+                    username for (username,) in db.session.query(User.username)
+                    .filter(User.username.in_([u["username"] for u in users_seed]))
+                }
+                existing_challenges = {
+                    title for (title,) in db.session.query(Challenge.title)
+                    .filter(Challenge.title.in_([c["title"] for c in challenges_seed]))
+                }
+                existing_resources = {
+                    title for (title,) in db.session.query(Resource.title)
+                    .filter(Resource.title.in_([r["title"] for r in resources_seed]))
+                }
+            
+            new_users = []
+            for user_data in users_seed:
+                # Check if user already exists
+                if user_data["username"] in existing_usernames:
+                    print(f"User {user_data['username']} already exists, skipping...")
+                    continue
+                new_users.append(user_data)
+            
+            # Password hashing is deliberately slow, so hash each distinct password once
+            hashes = {password: generate_password_hash(password) for password in {u["password"] for u in new_users}}
+            
+            user_rows = [
+                {
+                    "username": user_data["username"],
+                    "email": user_data["email"],
+                    "password_hash": hashes[user_data["password"]],
+                    "points": user_data["points"],
+                    "streak": user_data["streak"],
+                    "created_at": now,
+                    "last_activity": now
+                }
+                for user_data in new_users
+            ]
+            
+            challenge_rows = []
+            for challenge_data in challenges_seed:
+                # Check if challenge already exists
+                if challenge_data["title"] in existing_challenges:
+                    print(f"Challenge '{challenge_data['title']}' already exists, skipping...")
+                    continue
+                challenge_rows.append(dict(challenge_data, created_at=now))
+            
+            resource_rows = []
+            for resource_data in resources_seed:
+                # Check if resource already exists
+                if resource_data["title"] in existing_resources:
+                    print(f"Resource '{resource_data['title']}' already exists, skipping...")
+                    continue
+                resource_rows.append(dict(resource_data, created_at=now))
+            
+            _bulk_insert(db.session, User, user_rows)
+            _bulk_insert(db.session, Challenge, challenge_rows)
+            _bulk_insert(db.session, Resource, resource_rows)
         
-        # Commit all changes
-        db.session.commit()
+        # Commit all changes (the block above already did unless it was nested)
+        if in_outer_transaction:
+            db.session.commit()
         print("Database seeded successfully!")
 
 if __name__ == "__main__":
@@ -67,7 +67,7 @@ pip install -r requirements.txt
 
 # Install development dependencies for testing
 echo -e "\n${YELLOW}Installing development dependencies...${NC}"
-pip install pytest pytest-cov flake8 black isort
+pip install pytest pytest-cov ruff black isort
 echo -e "${GREEN}All dependencies installed!${NC}"
 
 # Create necessary directories for monitoring and logs
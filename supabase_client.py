@@ -1,19 +1,18 @@
 """
 Supabase client for the Moodle Exam Simulator
 """
-from supabase import create_client, Client
 import json
 import os
 import datetime
 import time
-import threading
-from functools import wraps
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
 from typing import Dict, List, Any, Optional, Union, Callable
-from dotenv import load_dotenv
 
 # Import monitoring, caching, and retry modules
 from monitoring import logger, track_performance, api_performance_monitor, track_errors
-from cache_manager import cached
+from cache_manager import cached, cache_manager
 from retry_manager import with_retry
 from supabase_config import (
     SUPABASE_URL, 
@@ -27,46 +26,67 @@ from supabase_config import (
     RESOURCES_TABLE
 )
 
-# Load environment variables
-load_dotenv()
+def create_client(supabase_url: str, supabase_key: str):
+    """
+    Create a Supabase client, importing the supabase package on first use
+    """
+    from supabase import create_client as _create_client
+    client = _create_client(supabase_url, supabase_key)
+    _configure_http_pool(client)
+    return client
 
-class SupabaseClient:
+# Connection pool bounds for the PostgREST HTTP session
+HTTP_POOL_LIMITS = {"max_connections": 20, "max_keepalive_connections": 20}
+
+def _configure_http_pool(client) -> None:
     """
-    A client for interacting with Supabase with optimized connection handling and caching
+    Swap the PostgREST HTTP session for one with explicit pool limits.
+    
+    httpx only takes limits when a client is built, so the session is rebuilt
+    with every setting httpx exposes on the old one carried over, including the
+    timeout postgrest configured. postgrest builds its session without custom
+    verify or transport options, so the defaults used here match.
     """
-    _instance = None
-    _lock = threading.Lock()
-    _cache = {}
-    _cache_ttl = {}
+    import httpx
+    from postgrest.utils import SyncClient
     
-    def __new__(cls):
-        with cls._lock:
-            if cls._instance is None:
-                cls._instance = super(SupabaseClient, cls).__new__(cls)
-                cls._instance.supabase = None
-                cls._instance._initialized = False
-        return cls._instance
+    session = getattr(client.postgrest, "session", None)
+    if not isinstance(session, httpx.Client):
+        logger.warning("PostgREST session not found, keeping its default connection pool")
+        return
     
+    client.postgrest.session = SyncClient(
+        base_url=session.base_url,
+        headers=session.headers,
+        params=session.params,
+        cookies=session.cookies,
+        auth=session.auth,
+        timeout=session.timeout,
+        follow_redirects=session.follow_redirects,
+        event_hooks=session.event_hooks,
+        trust_env=session.trust_env,
+        limits=httpx.Limits(**HTTP_POOL_LIMITS),
+    )
+    session.close()
+
+class SupabaseClient:
+    """
+    A client for interacting with Supabase with optimized connection handling and caching
+    """
     def __init__(self):
         """
         Initialize the Supabase client with connection pooling
         """
-        if self._initialized:
-            return
-            
         # Get configuration from environment variables or fallback to config file
         supabase_url = os.environ.get('SUPABASE_URL', SUPABASE_URL)
         supabase_key = os.environ.get('SUPABASE_KEY', SUPABASE_KEY)
         
-        if self.supabase is None:
-            self.supabase: Client = create_client(supabase_url, supabase_key)
-            self._initialize_storage()
-            self._cache_ttl_seconds = int(os.environ.get('CACHE_TTL', 300))  # Default 5 minutes cache TTL
-            
-            logger.info("Supabase client initialized", 
-                       cache_ttl=self._cache_ttl_seconds)
-            
-        self._initialized = True
+        self.supabase = create_client(supabase_url, supabase_key)
+        self._initialize_storage()
+        self._cache_ttl_seconds = int(os.environ.get('CACHE_TTL', 300))  # Default 5 minutes cache TTL
+        
+        logger.info("Supabase client initialized", 
+                   cache_ttl=self._cache_ttl_seconds)
     
     @track_performance
     def _initialize_storage(self):
@@ -74,39 +94,27 @@ class SupabaseClient:
         Initialize storage buckets if they don't exist
         """
         try:
-            # Check if buckets exist and create them if they don't
+            # List existing buckets in one request and create any that are missing
             buckets = [DOCUMENTS_BUCKET, CHALLENGES_BUCKET, USER_SOLUTIONS_BUCKET]
-            for bucket in buckets:
-                try:
-                    self.supabase.storage.get_bucket(bucket)
-                    logger.debug(f"Storage bucket exists: {bucket}")
-                except Exception:
-                    self.supabase.storage.create_bucket(bucket)
-                    logger.info(f"Created storage bucket: {bucket}")
+            existing = {b.name for b in self.supabase.storage.list_buckets()}
+            missing = [b for b in buckets if b not in existing]
+            if missing:
+                # Bucket creations are independent, so issue them concurrently
+                with ThreadPoolExecutor(max_workers=len(missing)) as executor:
+                    list(executor.map(self.supabase.storage.create_bucket, missing))
+                logger.info("Created storage buckets", buckets=missing)
             
             logger.info("Storage initialization complete", bucket_count=len(buckets))
         except Exception as e:
             logger.error(f"Error initializing storage: {str(e)}")
             raise
             
-    # Use the retry_manager module instead of this custom implementation
-    def retry_on_error(max_retries=3, delay=1):
-        """
-        Legacy decorator to retry operations on failure
-        Now uses the retry_manager module internally
-        """
-        return with_retry(max_retries=max_retries, retry_delay=delay*1000)
-        
     @track_performance
     def clear_cache(self):
         """
-        Clear the cache
+        Clear the cache shared by the @cached query methods
         """
-        with self._lock:
-            cache_size = len(self._cache)
-            self._cache = {}
-            self._cache_ttl = {}
-            logger.info(f"Supabase cache cleared", items_cleared=cache_size)
+        cache_manager.clear()
     
     # User management
     @track_performance
@@ -180,7 +188,7 @@ class SupabaseClient:
             return {"success": False, "error": str(e)}
     
     @track_performance
-    @cached(ttl=300)  # Cache user data for 5 minutes
+    @cached(ttl=300, method=True)  # Cache user data for 5 minutes
     @with_retry(max_retries=3, retry_delay=1000)
     def get_user(self, user_id: str) -> Dict[str, Any]:
         """
@@ -200,69 +208,62 @@ class SupabaseClient:
             return {"success": False, "error": str(e)}
     
     @track_performance
-    @cached(ttl=60)  # Cache profile for 1 minute as it changes frequently
+    @cached(ttl=60, method=True)  # Cache profile for 1 minute as it changes frequently
     @with_retry(max_retries=3, retry_delay=1000)
     def get_user_profile(self, user_id: str) -> Dict[str, Any]:
         """
         Get enhanced user profile with statistics and recent activities
         """
         try:
-            # Get basic user data
-            user_result = self.get_user(user_id)
-            if not user_result["success"]:
-                return user_result
+            # Get the user and their challenges with details in one parameterized RPC
+            try:
+                profile = self.supabase.rpc('select_user_challenges_with_details', {"user_id_param": user_id}).execute().data
+            except Exception:
+                # If RPC function doesn't exist, fall back to regular queries
+                user_result = self.get_user(user_id)
+                if not user_result["success"]:
+                    return user_result
                 
-            user_data = user_result["user"]
-            
-            # Get user challenges with challenge details
-            challenges_query = f"""
-            SELECT uc.*, c.title, c.language, c.points, c.difficulty 
-            FROM {USER_CHALLENGES_TABLE} uc 
-            JOIN {CHALLENGES_TABLE} c ON uc.challenge_id = c.id 
-            WHERE uc.user_id = '{user_id}' 
-            ORDER BY uc.completed_at DESC
-            """
-            
-            challenges = self.supabase.rpc('select_user_challenges_with_details', {"user_id_param": user_id}).execute()
-            
-            # If RPC function doesn't exist, fall back to regular query
-            if not challenges.data:
+                user_data = user_result["user"]
                 challenges = self.supabase.table(USER_CHALLENGES_TABLE)\
                     .select(f"*, {CHALLENGES_TABLE}(title, language, points, difficulty)")\
                     .eq("user_id", user_id)\
                     .order("completed_at", desc=True)\
                     .execute()
+                user_challenges = challenges.data if challenges.data else []
+            else:
+                if not profile or not profile.get("user"):
+                    return {"success": False, "error": "User not found"}
+                user_data = profile["user"]
+                user_challenges = profile.get("challenges") or []
             
-            user_challenges = challenges.data if challenges.data else []
+            challenges_table = CHALLENGES_TABLE  # local lookup inside the loops below
             
             # Process challenges for statistics
             total_challenges = len(user_challenges)
             completed_challenges = sum(1 for c in user_challenges if c.get("completed_at"))
             
             # Group by language
-            challenges_by_language = {}
-            for challenge in user_challenges:
-                # Get language from challenge or nested challenge data
-                language = challenge.get("language")
-                if not language and challenge.get(CHALLENGES_TABLE):
-                    language = challenge[CHALLENGES_TABLE].get("language")
-                language = language or "Unknown"
-                
-                if language not in challenges_by_language:
-                    challenges_by_language[language] = {"total": 0, "completed": 0}
-                
-                challenges_by_language[language]["total"] += 1
-                if challenge.get("completed_at"):
-                    challenges_by_language[language]["completed"] += 1
+            # Get language from challenge or nested challenge data
+            langs = [
+                c.get("language") or (c.get(challenges_table) or {}).get("language") or "Unknown"
+                for c in user_challenges
+            ]
+            totals = Counter(langs)
+            completed = Counter(l for l, c in zip(langs, user_challenges) if c.get("completed_at"))
+            challenges_by_language = {
+                l: {"total": totals[l], "completed": completed[l]} for l in totals
+            }
             
             # Format recent activities
             recent_activities = []
             for challenge in user_challenges[:10]:  # Get top 10 recent activities
-                challenge_data = challenge.get(CHALLENGES_TABLE, {})
+                # Nested challenge data if present, otherwise the flat RPC row
+                details = challenge.get(challenges_table) or challenge
                 activity = {
-                    "title": challenge_data.get("title") if challenge_data else challenge.get("title"),
-                    "language": challenge_data.get("language") if challenge_data else challenge.get("language"),
-                    "points": challenge_data.get("points") if challenge_data else challenge.get("points"),
+                    "title": details.get("title"),
+                    "language": details.get("language"),
+                    "points": details.get("points"),
                     "completed_at": challenge.get("completed_at"),
                     "challenge_id": challenge.get("challenge_id"),
                     "execution_time": challenge.get("execution_time")
@@ -316,7 +317,7 @@ class SupabaseClient:
             return {"success": False, "error": str(e)}
     
     @track_performance
-    @cached(ttl=3600)  # Cache documents for 1 hour
+    @cached(ttl=3600, method=True)  # Cache documents for 1 hour
     @with_retry(max_retries=3, retry_delay=1000)
     def get_document(self, storage_path: str) -> Dict[str, Any]:
         """
@@ -334,24 +335,27 @@ class SupabaseClient:
             return {"success": False, "error": str(e)}
     
     @track_performance
-    @cached(ttl=300)  # Cache document list for 5 minutes
+    @cached(ttl=300, method=True)  # Cache document list for 5 minutes
     @with_retry(max_retries=3, retry_delay=1000)
     def list_documents(self, user_id: str) -> Dict[str, Any]:
         """
         List all documents for a user
         """
         try:
-            files = self.supabase.storage.from_(DOCUMENTS_BUCKET).list(user_id)
+            bucket = self.supabase.storage.from_(DOCUMENTS_BUCKET)
+            files = bucket.list(user_id)
             
-            documents = []
-            for file in files:
-                file_url = self.supabase.storage.from_(DOCUMENTS_BUCKET).get_public_url(f"{user_id}/{file['name']}")
-                documents.append({
+            # Public URLs are just base URL + path, so build the prefix once
+            base_url = bucket.get_public_url("").rstrip("/")
+            documents = [
+                {
                     "name": file["name"],
-                    "url": file_url,
+                    "url": f"{base_url}/{user_id}/{file['name']}",
                     "size": file["metadata"]["size"],
                     "created_at": file["metadata"]["created_at"]
-                })
+                }
+                for file in files
+            ]
             
             return {
                 "success": True,
@@ -379,7 +383,7 @@ class SupabaseClient:
             return {"success": False, "error": str(e)}
     
     @track_performance
-    @cached(ttl=300)  # Cache challenges for 5 minutes
+    @cached(ttl=300, method=True)  # Cache challenges for 5 minutes
     @with_retry(max_retries=3, retry_delay=1000)
     def get_challenges(self) -> Dict[str, Any]:
         """
@@ -399,7 +403,7 @@ class SupabaseClient:
             return {"success": False, "error": str(e)}
     
     @track_performance
-    @cached(ttl=300)  # Cache individual challenges for 5 minutes
+    @cached(ttl=300, method=True)  # Cache individual challenges for 5 minutes
     @with_retry(max_retries=3, retry_delay=1000)
     def get_challenge(self, challenge_id: str) -> Dict[str, Any]:
         """
@@ -425,36 +429,27 @@ class SupabaseClient:
     def submit_challenge_solution(self, user_id: str, challenge_id: str, solution: str, execution_time: float) -> Dict[str, Any]:
         """
         Submit a solution for a challenge
+        
+        The submit_solution database function stores the solution and adds the
+        challenge's points to the user in one transaction and one round trip.
         """
         try:
-            # Store the solution in the user_challenges table
-            solution_data = {
-                "user_id": user_id,
-                "challenge_id": challenge_id,
-                "solution": solution,
-                "execution_time": execution_time,
-                "completed_at": "now()"
-            }
-            
-            result = self.supabase.table(USER_CHALLENGES_TABLE).insert(solution_data).execute()
-            
-            # Update user points
-            challenge = self.get_challenge(challenge_id)
-            if challenge["success"]:
-                points = challenge["challenge"].get("points", 10)
-                self.supabase.table(USERS_TABLE).update({
-                    "points": self.supabase.table(USERS_TABLE).select("points").eq("id", user_id).single().execute().data["points"] + points
-                }).eq("id", user_id).execute()
+            result = self.supabase.rpc('submit_solution', {
+                "uid": user_id,
+                "cid": challenge_id,
+                "sol": solution,
+                "exec_time": execution_time
+            }).execute()
             
             return {
                 "success": True,
-                "submission": result.data[0]
+                "submission": result.data
             }
         except Exception as e:
             return {"success": False, "error": str(e)}
     
     @track_performance
-    @cached(ttl=60)  # Cache user challenges for 1 minute
+    @cached(ttl=60, method=True)  # Cache user challenges for 1 minute
     @with_retry(max_retries=3, retry_delay=1000)
     def get_user_challenges(self, user_id: str) -> Dict[str, Any]:
         """
@@ -489,7 +484,7 @@ class SupabaseClient:
             return {"success": False, "error": str(e)}
     
     @track_performance
-    @cached(ttl=600)  # Cache resources for 10 minutes
+    @cached(ttl=600, method=True)  # Cache resources for 10 minutes
     @with_retry(max_retries=3, retry_delay=1000)
     def get_resources(self) -> Dict[str, Any]:
         """
@@ -504,3 +499,10 @@ class SupabaseClient:
             }
         except Exception as e:
             return {"success": False, "error": str(e)}
+
+@lru_cache(maxsize=None)
+def get_supabase_client() -> SupabaseClient:
+    """
+    Return the shared SupabaseClient, creating it on first use
+    """
+    return SupabaseClient()
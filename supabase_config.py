@@ -2,10 +2,20 @@
 Supabase configuration for the Moodle Exam Simulator
 """
 import os
-from dotenv import load_dotenv
+from functools import lru_cache
 
-# Load environment variables from .env file if present
-load_dotenv()
+@lru_cache(maxsize=1)
+def load_env():
+    """Load environment variables from the .env file at most once per process
+    
+    Variables already set in the process environment are not overridden.
+    """
+    from dotenv import load_dotenv
+    load_dotenv()
+
+# Load environment variables from .env file if present; any of them may be
+# missing from the process environment, so always read it
+load_env()
 
 # Supabase configuration
 # Use environment variables - no hardcoded defaults for security
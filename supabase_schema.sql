@@ -105,3 +105,53 @@ CREATE INDEX IF NOT EXISTS idx_user_challenges_user_id ON user_challenges(user_i
 CREATE INDEX IF NOT EXISTS idx_user_challenges_challenge_id ON user_challenges(challenge_id);
 CREATE INDEX IF NOT EXISTS idx_resources_user_id ON resources(user_id);
 CREATE INDEX IF NOT EXISTS idx_resources_category ON resources(category);
+
+-- Functions
+
+-- Atomically add points to a user in one statement and return the new total
+CREATE OR REPLACE FUNCTION increment_user_points(uid UUID, delta INTEGER)
+RETURNS INTEGER
+LANGUAGE sql
+AS $$
+    UPDATE users SET points = points + delta WHERE id = uid RETURNING points;
+$$;
+
+-- Record a solution and award the challenge's points in a single round trip
+CREATE OR REPLACE FUNCTION submit_solution(uid UUID, cid UUID, sol TEXT, exec_time FLOAT)
+RETURNS JSON
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    submission user_challenges;
+BEGIN
+    INSERT INTO user_challenges (user_id, challenge_id, solution, execution_time, completed_at)
+    VALUES (uid, cid, sol, exec_time, now())
+    RETURNING * INTO submission;
+
+    PERFORM increment_user_points(uid, COALESCE((SELECT points FROM challenges WHERE id = cid), 10));
+
+    RETURN row_to_json(submission);
+END;
+$$;
+
+-- Fetch a user together with their challenge history (flattened with challenge details)
+CREATE OR REPLACE FUNCTION select_user_challenges_with_details(user_id_param UUID)
+RETURNS JSON
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT json_build_object(
+        'user', row_to_json(u),
+        'challenges', COALESCE((
+            SELECT json_agg(row_to_json(d) ORDER BY d.completed_at DESC)
+            FROM (
+                SELECT uc.*, c.title, c.language, c.points, c.difficulty
+                FROM user_challenges uc
+                JOIN challenges c ON c.id = uc.challenge_id
+                WHERE uc.user_id = u.id
+            ) d
+        ), '[]'::json)
+    )
+    FROM users u
+    WHERE u.id = user_id_param;
+$$;
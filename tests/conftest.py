@@ -0,0 +1,20 @@
+"""
+Shared pytest hooks for the MoodleExamSimulator test suite.
+
+SQLAlchemy loads its SQLite dialect the first time an engine connects. It is
+warmed once before collection so that one-off cost doesn't land in whichever
+test happens to run first.
+"""
+
+
+def pytest_configure(config):
+    """Warm the SQLite dialect once per run, if SQLAlchemy is installed."""
+    try:
+        from sqlalchemy import create_engine
+    except ImportError:
+        # Tests that need SQLAlchemy will report that themselves
+        return
+
+    engine = create_engine('sqlite:///:memory:')
+    engine.connect().close()
+    engine.dispose()
@@ -0,0 +1,50 @@
+"""
+Shared fixtures for the MoodleExamSimulator performance tests.
+
+The database manager, Supabase client and worker thread pool are expensive
+to set up, so they are created once per test session and shared by every
+performance test.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+
+from supabase_config import load_env
+
+# Load environment variables (shared with supabase_config, parsed once)
+load_env()
+
+
+@pytest.fixture(scope="session")
+def db_manager():
+    """Fixture to provide a DBManager instance."""
+    from db_manager import DBManager
+    
+    # Initialize the DBManager
+    db_manager = DBManager()
+    yield db_manager
+    # Clean up
+    db_manager.close_all_connections()
+
+
+@pytest.fixture(scope="session")
+def supabase_client():
+    """Fixture to provide a SupabaseClient instance."""
+    from supabase_client import SupabaseClient
+    
+    # Check if Supabase URL and key are set
+    if not os.environ.get('SUPABASE_URL') or not os.environ.get('SUPABASE_KEY'):
+        pytest.skip("Supabase URL or key not set")
+    
+    # Initialize the SupabaseClient
+    client = SupabaseClient()
+    yield client
+
+
+@pytest.fixture(scope="session")
+def executor():
+    """Fixture to provide a thread pool shared by the concurrent tests."""
+    executor = ThreadPoolExecutor(max_workers=20)
+    yield executor
+    executor.shutdown(wait=True)
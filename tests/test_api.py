@@ -7,35 +7,129 @@ they function correctly and handle errors appropriately.
 
 import os
 import sys
-import json
 import pytest
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
 from unittest.mock import patch, MagicMock
 from datetime import datetime
+from functools import partial
+from werkzeug.security import generate_password_hash
 
 # Add parent directory to path to import modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Import Flask app
-from web_api import app, db
-from models import User, Challenge, UserChallenge
+# web_api and models are imported inside the fixtures and tests that need
+# them, so collecting this module doesn't build the Flask app
 
-@pytest.fixture
-def client():
-    """Create a test client for the Flask app."""
+# Fixed completion time for the seeded attempt
+_FIXED_NOW = datetime(2024, 1, 1)
+
+@pytest.fixture(scope="module")
+def database():
+    """Build the schema and test data once for this module."""
+    from web_api import app, db
+    
+    # Other test modules share this app, so its settings are put back afterwards
+    original_config = app.config.copy()
     app.config['TESTING'] = True
+    # Serve in-memory SQLite from one persistent connection (StaticPool), so
+    # every session in the module sees the same database. Under pytest-xdist
+    # each worker is its own process and so gets its own private database.
     app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'poolclass': StaticPool,
+        'connect_args': {'check_same_thread': False}
+    }
     app.config['WTF_CSRF_ENABLED'] = False
     
-    with app.test_client() as client:
+    # Password hashing is deliberately slow; a single PBKDF2 iteration keeps
+    # set_password/check_password round-tripping without the CPU cost
+    fast_hash = partial(generate_password_hash, method='pbkdf2:sha256:1')
+    hash_patcher = patch('models.generate_password_hash', fast_hash)
+    hash_patcher.start()
+    try:
         with app.app_context():
+            engine = db.get_engine()
+            
+            # pysqlite's own transaction handling breaks SAVEPOINTs; let
+            # SQLAlchemy emit BEGIN itself so per-test rollbacks work
+            @event.listens_for(engine, "connect")
+            def _disable_pysqlite_begin(dbapi_connection, connection_record):
+                dbapi_connection.isolation_level = None
+            
+            @event.listens_for(engine, "begin")
+            def _emit_begin(conn):
+                conn.exec_driver_sql("BEGIN")
+            
             db.create_all()
             # Create test data
             _create_test_data()
-            yield client
-            db.drop_all()
+            yield engine
+            
+            # Closing the pool's only connection drops the in-memory database
+            # and its rows, so the next user of the engine starts empty
+            db.session.remove()
+            event.remove(engine, "connect", _disable_pysqlite_begin)
+            event.remove(engine, "begin", _emit_begin)
+            db.engine.dispose()
+    finally:
+        hash_patcher.stop()
+        app.config.clear()
+        app.config.update(original_config)
+
+@pytest.fixture
+def client(database):
+    """Create a test client whose database changes are rolled back after the test."""
+    from web_api import app, db
+    
+    with app.test_client() as client:
+        with app.app_context():
+            connection = database.connect()
+            transaction = connection.begin()
+            
+            # Every session opened during the test joins the outer transaction,
+            # and commits only release a SAVEPOINT that is restarted right away
+            # (SQLAlchemy's "joining a session into an external transaction")
+            session = db.create_scoped_session(options={'bind': connection, 'binds': {}})
+            nested = connection.begin_nested()
+            
+            @event.listens_for(session, "after_transaction_end")
+            def _restart_savepoint(sess, trans):
+                nonlocal nested
+                if not nested.is_active:
+                    nested = connection.begin_nested()
+            
+            # The views read db.session, so the test session is installed there
+            # for the duration of the test
+            try:
+                with patch.object(db, 'session', session):
+                    yield client
+            finally:
+                session.remove()
+                transaction.rollback()
+                connection.close()
+
+@pytest.fixture(autouse=True, scope="module")
+def mock_code_tester():
+    """Replace the Docker-backed code tester for every test in the module."""
+    with patch('web_api.code_tester') as mock_tester:
+        mock_tester.test_python_code.return_value = {'output': '', 'error': '', 'execution_time': 0}
+        yield mock_tester
+
+@pytest.fixture
+def authed_client(client):
+    """Create a test client already logged in as the test user."""
+    client.post('/api/login', json={
+        'username': 'testuser',
+        'password': 'password123'
+    })
+    return client
 
 def _create_test_data():
     """Create test data for the database."""
+    from web_api import db
+    from models import User, Challenge, UserChallenge
+    
     # Create test users
     user1 = User(username='testuser', email='test@example.com')
     user1.set_password('password123')
@@ -63,21 +157,18 @@ def _create_test_data():
         created_by=1
     )
     
-    # Add to database
-    db.session.add(user1)
-    db.session.add(user2)
-    db.session.add(challenge1)
-    db.session.add(challenge2)
-    db.session.commit()
+    # Add to database; flush assigns the IDs without committing
+    db.session.add_all([user1, user2, challenge1, challenge2])
+    db.session.flush()
     
     # Create user challenge attempts
     user_challenge = UserChallenge(
-        user_id=1,
-        challenge_id=1,
+        user_id=user1.id,
+        challenge_id=challenge1.id,
         status='completed',
         score=8,
         attempt_count=2,
-        completed_at=datetime.utcnow()
+        completed_at=_FIXED_NOW
     )
     
     db.session.add(user_challenge)
@@ -94,7 +185,7 @@ def test_health_check(client):
         
         response = client.get('/api/health')
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data['overall_status'] == 'healthy'
         assert 'api' in data
         assert 'database' in data
@@ -108,11 +199,14 @@ def test_register_success(client):
     })
     
     assert response.status_code == 201
-    data = json.loads(response.data)
+    data = response.get_json()
     assert data['success'] is True
     assert 'user_id' in data
     
     # Verify user was created in database
+    from web_api import app
+    from models import User
+    
     with app.app_context():
         user = User.query.filter_by(username='newuser').first()
         assert user is not None
@@ -127,7 +221,7 @@ def test_register_missing_fields(client):
     })
     
     assert response.status_code == 400
-    data = json.loads(response.data)
+    data = response.get_json()
     assert data['success'] is False
     assert 'Missing required fields' in data['message']
 
@@ -140,7 +234,7 @@ def test_register_duplicate_username(client):
     })
     
     assert response.status_code == 409
-    data = json.loads(response.data)
+    data = response.get_json()
     assert data['success'] is False
     assert 'Username already exists' in data['message']
 
@@ -152,7 +246,7 @@ def test_login_success(client):
     })
     
     assert response.status_code == 200
-    data = json.loads(response.data)
+    data = response.get_json()
     assert data['success'] is True
     assert 'user' in data
     assert data['user']['username'] == 'testuser'
@@ -165,139 +259,83 @@ def test_login_invalid_credentials(client):
     })
     
     assert response.status_code == 401
-    data = json.loads(response.data)
+    data = response.get_json()
     assert data['success'] is False
     assert 'Invalid credentials' in data['message']
 
-def test_get_challenges(client):
+def test_get_challenges(authed_client):
     """Test getting all challenges."""
-    # Login first
-    client.post('/api/login', json={
-        'username': 'testuser',
-        'password': 'password123'
-    })
-    
-    response = client.get('/api/challenges')
+    response = authed_client.get('/api/challenges')
     assert response.status_code == 200
-    data = json.loads(response.data)
+    data = response.get_json()
     assert len(data['challenges']) == 2
     assert data['challenges'][0]['title'] == 'Test Challenge 1'
     assert data['challenges'][1]['title'] == 'Test Challenge 2'
 
-def test_get_challenge_by_id(client):
+def test_get_challenge_by_id(authed_client):
     """Test getting a specific challenge by ID."""
-    # Login first
-    client.post('/api/login', json={
-        'username': 'testuser',
-        'password': 'password123'
-    })
-    
-    response = client.get('/api/challenges/1')
+    response = authed_client.get('/api/challenges/1')
     assert response.status_code == 200
-    data = json.loads(response.data)
+    data = response.get_json()
     assert data['challenge']['title'] == 'Test Challenge 1'
     assert data['challenge']['difficulty'] == 'easy'
 
-def test_get_nonexistent_challenge(client):
+def test_get_nonexistent_challenge(authed_client):
     """Test getting a challenge that doesn't exist."""
-    # Login first
-    client.post('/api/login', json={
-        'username': 'testuser',
-        'password': 'password123'
-    })
-    
-    response = client.get('/api/challenges/999')
+    response = authed_client.get('/api/challenges/999')
     assert response.status_code == 404
-    data = json.loads(response.data)
+    data = response.get_json()
     assert data['success'] is False
     assert 'Challenge not found' in data['message']
 
-def test_submit_code_python(client):
-    """Test submitting Python code for evaluation."""
-    # Login first
-    client.post('/api/login', json={
-        'username': 'testuser',
-        'password': 'password123'
-    })
+@pytest.mark.parametrize("code,mock_result,expected_success", [
+    ('print("Hello, World!")',
+     {'output': 'Test output', 'error': '', 'execution_time': 50},
+     True),
+    ('print("Hello, World!"',  # Missing closing parenthesis
+     {'output': '', 'error': 'SyntaxError: invalid syntax', 'execution_time': 10},
+     False),
+], ids=['python', 'error'])
+def test_submit_code(authed_client, mock_code_tester, code, mock_result, expected_success):
+    """Test submitting Python code that runs cleanly or produces an error."""
+    # Mock the code tester response
+    mock_code_tester.test_python_code.return_value = mock_result
     
-    with patch('web_api.code_tester') as mock_tester:
-        # Mock the code tester response
-        mock_tester.test_python_code.return_value = {
-            'output': 'Test output',
-            'error': '',
-            'execution_time': 50
-        }
-        
-        response = client.post('/api/submit', json={
-            'challenge_id': 1,
-            'language': 'python',
-            'code': 'print("Hello, World!")',
-            'expected_output': 'Hello, World!'
-        })
-        
-        assert response.status_code == 200
-        data = json.loads(response.data)
-        assert data['success'] is True
-        assert data['output'] == 'Test output'
-        assert data['error'] == ''
-
-def test_submit_code_error(client):
-    """Test submitting code that produces an error."""
-    # Login first
-    client.post('/api/login', json={
-        'username': 'testuser',
-        'password': 'password123'
+    response = authed_client.post('/api/submit', json={
+        'challenge_id': 1,
+        'language': 'python',
+        'code': code,
+        'expected_output': 'Hello, World!'
     })
     
-    with patch('web_api.code_tester') as mock_tester:
-        # Mock the code tester response with an error
-        mock_tester.test_python_code.return_value = {
-            'output': '',
-            'error': 'SyntaxError: invalid syntax',
-            'execution_time': 10
-        }
-        
-        response = client.post('/api/submit', json={
-            'challenge_id': 1,
-            'language': 'python',
-            'code': 'print("Hello, World!"',  # Missing closing parenthesis
-            'expected_output': 'Hello, World!'
-        })
-        
-        assert response.status_code == 200
-        data = json.loads(response.data)
-        assert data['success'] is False
-        assert 'SyntaxError' in data['error']
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['success'] is expected_success
+    assert data['output'] == mock_result['output']
+    assert data['error'] == mock_result['error']
 
-def test_user_progress(client):
+def test_user_progress(authed_client):
     """Test getting user progress."""
-    # Login first
-    client.post('/api/login', json={
-        'username': 'testuser',
-        'password': 'password123'
-    })
-    
-    response = client.get('/api/user/progress')
+    response = authed_client.get('/api/user/progress')
     assert response.status_code == 200
-    data = json.loads(response.data)
+    data = response.get_json()
     assert 'completed_challenges' in data
     assert 'total_points' in data
     assert len(data['completed_challenges']) == 1
     assert data['completed_challenges'][0]['challenge_id'] == 1
 
-def test_unauthorized_access(client):
-    """Test accessing protected routes without authentication."""
-    response = client.get('/api/challenges')
-    assert response.status_code == 401
-    
-    response = client.get('/api/user/progress')
-    assert response.status_code == 401
-    
-    response = client.post('/api/submit', json={
+@pytest.mark.parametrize("method,path,body", [
+    ('GET', '/api/challenges', None),
+    ('GET', '/api/user/progress', None),
+    ('POST', '/api/submit', {
         'challenge_id': 1,
         'language': 'python',
         'code': 'print("Hello")'
-    })
+    }),
+])
+def test_unauthorized_access(client, method, path, body):
+    """Test accessing protected routes without authentication."""
+    response = client.open(path, method=method, json=body)
     assert response.status_code == 401
 
 if __name__ == '__main__':
@@ -5,12 +5,16 @@ This module contains unit tests for the DBManager class, testing connection pool
 retry mechanisms, and thread safety.
 """
 
-import os
 import unittest
 import threading
 import time
-from unittest.mock import patch, MagicMock
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch, MagicMock, NonCallableMagicMock, DEFAULT
 import pytest
+from sqlalchemy.engine import Engine
+from pymongo import MongoClient
+from neo4j import Driver
+from mysql.connector.pooling import MySQLConnectionPool
 from sqlalchemy.exc import OperationalError
 from pymongo.errors import ConnectionFailure
 from neo4j.exceptions import ServiceUnavailable
@@ -18,37 +22,48 @@ from neo4j.exceptions import ServiceUnavailable
 # Import the module to test
 from db_manager import DBManager
 
+# Connection settings applied to every test
+TEST_ENV = {
+    'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+    'NEO4J_HOST': 'localhost',
+    'NEO4J_PORT': '7687',
+    'NEO4J_USER': 'neo4j',
+    'NEO4J_PASSWORD': 'password',
+    'MONGO_HOST': 'localhost',
+    'MONGO_PORT': '27017',
+    'MYSQL_HOST': 'localhost',
+    'MYSQL_PORT': '3306',
+    'MYSQL_USER': 'test',
+    'MYSQL_PASSWORD': 'test',
+    'MYSQL_DATABASE': 'test',
+}
+
+def mongo_client_mock():
+    """Build a MongoClient mock limited to the client's real attributes."""
+    client = NonCallableMagicMock(spec=MongoClient)
+    # Databases such as ``admin`` come from MongoClient.__getattr__, which a
+    # spec cannot see, so the one DBManager pings is attached explicitly.
+    client.admin = MagicMock()
+    return client
+
 class TestDBManager(unittest.TestCase):
     """Test cases for the DBManager class."""
 
+    @pytest.fixture(autouse=True)
+    def connection_env(self, monkeypatch):
+        """Set the connection environment variables, undone after each test."""
+        for name, value in TEST_ENV.items():
+            monkeypatch.setenv(name, value)
+        # unittest methods can't request fixtures, so keep it for the tests
+        self.monkeypatch = monkeypatch
+
     def setUp(self):
         """Set up test fixtures."""
-        # Save original environment variables
-        self.original_env = os.environ.copy()
-        
-        # Set test environment variables
-        os.environ['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
-        os.environ['NEO4J_HOST'] = 'localhost'
-        os.environ['NEO4J_PORT'] = '7687'
-        os.environ['NEO4J_USER'] = 'neo4j'
-        os.environ['NEO4J_PASSWORD'] = 'password'
-        os.environ['MONGO_HOST'] = 'localhost'
-        os.environ['MONGO_PORT'] = '27017'
-        os.environ['MYSQL_HOST'] = 'localhost'
-        os.environ['MYSQL_PORT'] = '3306'
-        os.environ['MYSQL_USER'] = 'test'
-        os.environ['MYSQL_PASSWORD'] = 'test'
-        os.environ['MYSQL_DATABASE'] = 'test'
-        
         # Reset the singleton instance
         DBManager._instance = None
 
     def tearDown(self):
         """Tear down test fixtures."""
-        # Restore original environment variables
-        os.environ.clear()
-        os.environ.update(self.original_env)
-        
         # Close any open connections
         if DBManager._instance:
             DBManager._instance.close_all_connections()
@@ -58,7 +73,7 @@ class TestDBManager(unittest.TestCase):
     def test_singleton_pattern(self, mock_create_engine):
         """Test that DBManager follows the singleton pattern."""
         # Mock SQLAlchemy engine
-        mock_engine = MagicMock()
+        mock_engine = NonCallableMagicMock(spec=Engine)
         mock_create_engine.return_value = mock_engine
         
         # Create two instances
@@ -71,14 +86,17 @@ class TestDBManager(unittest.TestCase):
         # Verify create_engine was called only once
         mock_create_engine.assert_called_once()
 
-    @patch('db_manager.create_engine')
-    @patch('db_manager.MongoClient')
-    @patch('db_manager.GraphDatabase')
+    @patch.multiple('db_manager', create_engine=DEFAULT, MongoClient=DEFAULT,
+                    GraphDatabase=DEFAULT, autospec=False)
     @patch('db_manager.mysql.connector.pooling.MySQLConnectionPool')
-    def test_initialize_connections(self, mock_mysql_pool, mock_neo4j, mock_mongo, mock_create_engine):
+    def test_initialize_connections(self, mock_mysql_pool, **mocks):
         """Test that connections are initialized correctly."""
+        mock_create_engine = mocks['create_engine']
+        mock_mongo = mocks['MongoClient']
+        mock_neo4j = mocks['GraphDatabase']
+        
         # Mock SQLAlchemy engine
-        mock_engine = MagicMock()
+        mock_engine = NonCallableMagicMock(spec=Engine)
         mock_create_engine.return_value = mock_engine
         
         # Create DBManager instance
@@ -94,7 +112,7 @@ class TestDBManager(unittest.TestCase):
     def test_get_sqlalchemy_session(self, mock_create_engine):
         """Test getting a SQLAlchemy session."""
         # Mock SQLAlchemy engine and session
-        mock_engine = MagicMock()
+        mock_engine = NonCallableMagicMock(spec=Engine)
         mock_session = MagicMock()
         mock_engine.begin.return_value.__enter__.return_value = mock_session
         mock_create_engine.return_value = mock_engine
@@ -114,11 +132,11 @@ class TestDBManager(unittest.TestCase):
     def test_get_mongodb_database(self, mock_mongo, mock_create_engine):
         """Test getting a MongoDB database."""
         # Mock MongoDB client
-        mock_mongo_client = MagicMock()
+        mock_mongo_client = mongo_client_mock()
         mock_mongo.return_value = mock_mongo_client
         
         # Mock SQLAlchemy engine
-        mock_engine = MagicMock()
+        mock_engine = NonCallableMagicMock(spec=Engine)
         mock_create_engine.return_value = mock_engine
         
         # Create DBManager instance
@@ -136,13 +154,13 @@ class TestDBManager(unittest.TestCase):
     def test_get_neo4j_session(self, mock_neo4j, mock_create_engine):
         """Test getting a Neo4j session."""
         # Mock Neo4j driver and session
-        mock_driver = MagicMock()
+        mock_driver = NonCallableMagicMock(spec=Driver)
         mock_session = MagicMock()
         mock_driver.session.return_value = mock_session
         mock_neo4j.driver.return_value = mock_driver
         
         # Mock SQLAlchemy engine
-        mock_engine = MagicMock()
+        mock_engine = NonCallableMagicMock(spec=Engine)
         mock_create_engine.return_value = mock_engine
         
         # Create DBManager instance
@@ -160,13 +178,13 @@ class TestDBManager(unittest.TestCase):
     def test_get_mysql_connection(self, mock_mysql_pool, mock_create_engine):
         """Test getting a MySQL connection."""
         # Mock MySQL pool and connection
-        mock_pool = MagicMock()
+        mock_pool = NonCallableMagicMock(spec=MySQLConnectionPool)
         mock_connection = MagicMock()
         mock_pool.get_connection.return_value = mock_connection
         mock_mysql_pool.return_value = mock_pool
         
         # Mock SQLAlchemy engine
-        mock_engine = MagicMock()
+        mock_engine = NonCallableMagicMock(spec=Engine)
         mock_create_engine.return_value = mock_engine
         
         # Create DBManager instance
@@ -183,44 +201,44 @@ class TestDBManager(unittest.TestCase):
     def test_retry_mechanism(self, mock_create_engine):
         """Test retry mechanism for database connections."""
         # Mock SQLAlchemy engine that fails the first two times
-        mock_engine = MagicMock()
+        mock_engine = NonCallableMagicMock(spec=Engine)
         mock_create_engine.side_effect = [
             OperationalError("mock error", None, None),
             OperationalError("mock error", None, None),
             mock_engine
         ]
         
+        # Record the retry delays instead of sleeping to speed up test
+        sleeps = []
+        self.monkeypatch.setattr('db_manager.time.sleep', sleeps.append)
+        
         # Create DBManager instance with retry
-        with patch('db_manager.time.sleep') as mock_sleep:  # Mock sleep to speed up test
-            db_manager = DBManager()
+        db_manager = DBManager()
         
         # Verify create_engine was called three times
         self.assertEqual(mock_create_engine.call_count, 3)
         
         # Verify sleep was called twice
-        self.assertEqual(mock_sleep.call_count, 2)
+        self.assertEqual(len(sleeps), 2)
 
     @patch('db_manager.create_engine')
     def test_thread_safety(self, mock_create_engine):
         """Test thread safety of DBManager."""
         # Mock SQLAlchemy engine
-        mock_engine = MagicMock()
+        mock_engine = NonCallableMagicMock(spec=Engine)
         mock_create_engine.return_value = mock_engine
         
-        # Create DBManager instances in multiple threads
+        # Create DBManager instances in multiple threads, released together by
+        # the barrier so they actually contend for the singleton lock
+        barrier = threading.Barrier(10)
+        
         def create_instance():
+            barrier.wait()
             return DBManager()
         
-        threads = []
-        instances = []
-        
-        for _ in range(10):
-            thread = threading.Thread(target=lambda: instances.append(create_instance()))
-            threads.append(thread)
-            thread.start()
-        
-        for thread in threads:
-            thread.join()
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            futures = [executor.submit(create_instance) for _ in range(10)]
+            instances = [future.result() for future in futures]
         
         # Verify all instances are the same
         first_instance = instances[0]
@@ -230,17 +248,20 @@ class TestDBManager(unittest.TestCase):
         # Verify create_engine was called only once
         mock_create_engine.assert_called_once()
 
-    @patch('db_manager.create_engine')
-    @patch('db_manager.MongoClient')
-    @patch('db_manager.GraphDatabase')
+    @patch.multiple('db_manager', create_engine=DEFAULT, MongoClient=DEFAULT,
+                    GraphDatabase=DEFAULT, autospec=False)
     @patch('db_manager.mysql.connector.pooling.MySQLConnectionPool')
-    def test_close_all_connections(self, mock_mysql_pool, mock_neo4j, mock_mongo, mock_create_engine):
+    def test_close_all_connections(self, mock_mysql_pool, **mocks):
         """Test closing all connections."""
+        mock_create_engine = mocks['create_engine']
+        mock_mongo = mocks['MongoClient']
+        mock_neo4j = mocks['GraphDatabase']
+        
         # Mock connections
-        mock_engine = MagicMock()
-        mock_mongo_client = MagicMock()
-        mock_driver = MagicMock()
-        mock_pool = MagicMock()
+        mock_engine = NonCallableMagicMock(spec=Engine)
+        mock_mongo_client = mongo_client_mock()
+        mock_driver = NonCallableMagicMock(spec=Driver)
+        mock_pool = NonCallableMagicMock(spec=MySQLConnectionPool)
         
         mock_create_engine.return_value = mock_engine
         mock_mongo.return_value = mock_mongo_client
@@ -7,7 +7,6 @@ database connections, Supabase connectivity, and metrics endpoints.
 
 import os
 import unittest
-import json
 from unittest.mock import patch, MagicMock
 import pytest
 from flask import Flask
@@ -16,33 +15,49 @@ from flask import Flask
 from health_api import health_api
 from health_check import HealthCheck
 
+class FakePsutil:
+    """Stand-in for psutil with a fixed boot time."""
+    boot_time = staticmethod(lambda: 1623499200)  # 2021-06-12T12:00:00Z
+
 class TestHealthAPI(unittest.TestCase):
     """Test cases for the Health API endpoints."""
 
-    def setUp(self):
-        """Set up test fixtures."""
+    @classmethod
+    def setUpClass(cls):
+        """Set up the app and mocks once for all tests in the class."""
         # Create a Flask test app
-        self.app = Flask(__name__)
-        self.app.register_blueprint(health_api, url_prefix='/api')
-        self.client = self.app.test_client()
+        cls.app = Flask(__name__)
+        cls.app.register_blueprint(health_api, url_prefix='/api')
+        cls.client = cls.app.test_client()
         
         # Mock the health_check_service
-        self.patcher = patch('health_api.health_check_service')
-        self.mock_health_service = self.patcher.start()
+        cls.patcher = patch('health_api.health_check_service')
+        cls.mock_health_service = cls.patcher.start()
         
         # Mock DBManager
-        self.db_patcher = patch('health_api.DBManager')
-        self.mock_db_manager = self.db_patcher.start()
+        cls.db_patcher = patch('health_api.DBManager')
+        cls.mock_db_manager = cls.db_patcher.start()
         
-        # Mock SupabaseClient
-        self.supabase_patcher = patch('health_api.SupabaseClient')
-        self.mock_supabase = self.supabase_patcher.start()
+        # Mock the shared SupabaseClient accessor
+        cls.supabase_patcher = patch('health_api.get_supabase_client')
+        cls.mock_supabase = cls.supabase_patcher.start()
+        
+        # Fix the boot time used for the uptime metric
+        cls.psutil_patcher = patch('health_api.psutil', FakePsutil)
+        cls.psutil_patcher.start()
 
-    def tearDown(self):
-        """Tear down test fixtures."""
-        self.patcher.stop()
-        self.db_patcher.stop()
-        self.supabase_patcher.stop()
+    @classmethod
+    def tearDownClass(cls):
+        """Tear down the class-wide mocks."""
+        cls.patcher.stop()
+        cls.db_patcher.stop()
+        cls.supabase_patcher.stop()
+        cls.psutil_patcher.stop()
+
+    def setUp(self):
+        """Reset mock state so each test starts clean."""
+        for mock in (self.mock_health_service, self.mock_db_manager, self.mock_supabase):
+            mock.reset_mock(return_value=True, side_effect=True)
 
     def test_system_health_endpoint(self):
         """Test the system health endpoint."""
@@ -70,7 +85,7 @@ class TestHealthAPI(unittest.TestCase):
         
         # Verify response
         self.assertEqual(response.status_code, 200)
-        data = json.loads(response.data)
+        data = response.get_json()
         self.assertEqual(data['overall_status'], 'healthy')
         self.assertIn('system', data)
         self.assertIn('services', data)
@@ -105,7 +120,7 @@ class TestHealthAPI(unittest.TestCase):
         
         # Verify response
         self.assertEqual(response.status_code, 503)  # Service Unavailable
-        data = json.loads(response.data)
+        data = response.get_json()
         self.assertEqual(data['overall_status'], 'degraded')
 
     def test_database_health_endpoint(self):
@@ -146,7 +161,7 @@ class TestHealthAPI(unittest.TestCase):
         
         # Verify response
         self.assertEqual(response.status_code, 200)
-        data = json.loads(response.data)
+        data = response.get_json()
         self.assertEqual(data['status'], 'healthy')
         self.assertIn('databases', data)
         self.assertIn('sqlalchemy', data['databases'])
@@ -162,7 +177,8 @@ class TestHealthAPI(unittest.TestCase):
         mock_db_instance.get_mysql_connection.assert_called_once()
         mock_mysql_cursor.execute.assert_called_once_with("SELECT 1")
 
-    def test_supabase_health_endpoint(self):
+    @patch('health_api.cache_manager')
+    def test_supabase_health_endpoint(self, mock_cache_manager):
         """Test the Supabase health endpoint."""
         # Mock SupabaseClient instance
         mock_supabase_instance = MagicMock()
@@ -182,7 +198,10 @@ class TestHealthAPI(unittest.TestCase):
         mock_select.execute.return_value = mock_response
         
         # Mock cache stats
-        mock_supabase_instance._cache = {'key1': 'value1', 'key2': 'value2'}
+        mock_cache_manager.get_stats.return_value = {
+            'total_items': 3, 'expired_items': 1, 'active_items': 2,
+            'default_ttl': 3600, 'max_size': 1000
+        }
         mock_supabase_instance.cache_hit_rate = 0.75
         
         # Make request to the endpoint
@@ -190,7 +209,7 @@ class TestHealthAPI(unittest.TestCase):
         
         # Verify response
         self.assertEqual(response.status_code, 200)
-        data = json.loads(response.data)
+        data = response.get_json()
         self.assertEqual(data['status'], 'healthy')
         self.assertIn('details', data)
         self.assertEqual(data['details']['connection'], 'successful')
@@ -203,8 +222,9 @@ class TestHealthAPI(unittest.TestCase):
         mock_table.select.assert_called_once_with('count', count='exact')
         mock_select.execute.assert_called_once()
 
-    @patch('health_api.psutil')
-    def test_system_metrics_endpoint(self, mock_psutil):
+    # time.time is the shared stdlib function, so it is only frozen for this test
+    @patch('health_api.time.time', return_value=1623502800)  # 2021-06-12T13:00:00Z (1 hour uptime)
+    def test_system_metrics_endpoint(self, mock_time):
         """Test the system metrics endpoint."""
         # Mock health check service response
         self.mock_health_service.check_system_resources.return_value = {
@@ -227,16 +247,12 @@ class TestHealthAPI(unittest.TestCase):
             'moodle_mysql': {'is_running': True, 'status': 'running', 'cpu_percent': 2.0, 'memory_usage': 268435456}
         }[container]
         
-        # Mock psutil boot time
-        mock_psutil.boot_time.return_value = 1623499200  # 2021-06-12T12:00:00Z
-        
         # Make request to the endpoint
-        with patch('health_api.time.time', return_value=1623502800):  # 2021-06-12T13:00:00Z (1 hour uptime)
-            response = self.client.get('/api/health/metrics')
+        response = self.client.get('/api/health/metrics')
         
         # Verify response
         self.assertEqual(response.status_code, 200)
-        data = json.loads(response.data)
+        data = response.get_json()
         self.assertIn('system', data)
         self.assertIn('containers', data)
         self.assertIn('uptime', data)
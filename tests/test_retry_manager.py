@@ -12,7 +12,7 @@ from unittest.mock import patch, MagicMock, call
 import pytest
 
 # Import the module to test
-from retry_manager import RetryManager, RetryError, with_retry, retry_manager
+from retry_manager import RetryManager, RetryError, with_retry, retry_manager, reload_env
 
 class TestRetryManager(unittest.TestCase):
     """Test cases for the RetryManager class."""
@@ -26,12 +26,14 @@ class TestRetryManager(unittest.TestCase):
         os.environ['MAX_RETRIES'] = '3'
         os.environ['RETRY_DELAY'] = '100'
         os.environ['MAX_DELAY'] = '5000'
+        reload_env()
 
     def tearDown(self):
         """Tear down test fixtures."""
         # Restore original environment variables
         os.environ.clear()
         os.environ.update(self.original_env)
+        reload_env()
 
     def test_init_with_defaults(self):
         """Test initialization with default values."""
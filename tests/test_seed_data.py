@@ -0,0 +1,34 @@
+"""
+Tests for the seed data script.
+
+This module contains unit tests for the helpers seed_data uses to load rows,
+checking the COPY statement built for PostgreSQL.
+"""
+
+import unittest
+from sqlalchemy.dialects import postgresql
+
+# Import the module to test
+from seed_data import _copy_sql
+from models import User
+
+class TestCopySQL(unittest.TestCase):
+    """Test cases for the PostgreSQL COPY statement."""
+
+    def test_user_table_is_quoted(self):
+        """Test that the reserved user table name is quoted."""
+        copy_sql = _copy_sql(postgresql.dialect(), User, ['username', 'email'])
+        
+        self.assertEqual(
+            copy_sql,
+            'COPY "user" (username, email) FROM STDIN WITH (FORMAT CSV)'
+        )
+
+    def test_reserved_column_is_quoted(self):
+        """Test that reserved column names are quoted."""
+        copy_sql = _copy_sql(postgresql.dialect(), User, ['id', 'user'])
+        
+        self.assertIn('(id, "user")', copy_sql)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,12 +8,16 @@ from datetime import datetime, timedelta
 # Add parent directory to path to import modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from supabase_client import SupabaseClient
+from supabase_client import SupabaseClient, get_supabase_client, _configure_http_pool
+from cache_manager import cache_manager
 from supabase_config import CHALLENGES_TABLE, USERS_TABLE, RESOURCES_TABLE
 
 class TestSupabaseClient(unittest.TestCase):
     
     def setUp(self):
+        # Cached query results are shared by every instance, so start empty
+        cache_manager.clear()
+        
         # Create a patched version of the Supabase client
         self.patcher = patch('supabase_client.create_client')
         self.mock_create_client = self.patcher.start()
@@ -24,12 +28,13 @@ class TestSupabaseClient(unittest.TestCase):
         self.client = SupabaseClient()
         
     def tearDown(self):
+        get_supabase_client.cache_clear()
         self.patcher.stop()
     
-    def test_singleton_pattern(self):
-        """Test that the singleton pattern works correctly"""
-        client1 = SupabaseClient()
-        client2 = SupabaseClient()
+    def test_shared_instance(self):
+        """Test that get_supabase_client returns one shared instance"""
+        client1 = get_supabase_client()
+        client2 = get_supabase_client()
         self.assertIs(client1, client2)
     
     def test_register_user(self):
@@ -115,6 +120,22 @@ class TestSupabaseClient(unittest.TestCase):
         self.assertEqual(result1, result2)
         self.assertEqual(len(result1), 2)
     
+    def test_cache_shared_across_instances(self):
+        """Test that cached results are keyed without the instance"""
+        mock_query = MagicMock()
+        self.mock_supabase.table.return_value = mock_query
+        mock_query.select.return_value = mock_query
+        mock_query.execute.return_value = MagicMock(data=[{'id': 1, 'title': 'Challenge 1'}])
+        
+        result1 = self.client.get_challenges()
+        
+        # A second instance finds the first one's entry instead of querying again
+        self.mock_supabase.reset_mock()
+        result2 = SupabaseClient().get_challenges()
+        
+        self.mock_supabase.table.assert_not_called()
+        self.assertEqual(result1, result2)
+    
     def test_get_challenges_cache_expiry(self):
         """Test that cache expires after TTL"""
         # Set up mock data
@@ -177,5 +198,42 @@ class TestSupabaseClient(unittest.TestCase):
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0]['title'], 'Challenge 1')
 
+class TestConfigureHttpPool(unittest.TestCase):
+    
+    def test_session_settings_carried_over(self):
+        """Test that the rebuilt PostgREST session keeps the old session's settings"""
+        import httpx
+        
+        session = httpx.Client(
+            base_url='https://example.supabase.co/rest/v1',
+            headers={'apikey': 'test-key'},
+            params={'select': '*'},
+            timeout=httpx.Timeout(12.0),
+            follow_redirects=True
+        )
+        client = MagicMock()
+        client.postgrest.session = session
+        
+        _configure_http_pool(client)
+        
+        new_session = client.postgrest.session
+        self.assertIsNot(new_session, session)
+        self.assertEqual(new_session.base_url, session.base_url)
+        self.assertEqual(new_session.headers['apikey'], 'test-key')
+        self.assertEqual(new_session.params, session.params)
+        self.assertEqual(new_session.timeout, httpx.Timeout(12.0))
+        self.assertTrue(new_session.follow_redirects)
+        self.assertTrue(session.is_closed)
+        new_session.close()
+    
+    def test_missing_session_left_alone(self):
+        """Test that a client without a PostgREST session is not touched"""
+        client = MagicMock()
+        client.postgrest = object()
+        
+        _configure_http_pool(client)
+        
+        self.assertFalse(hasattr(client.postgrest, 'session'))
+
 if __name__ == '__main__':
     unittest.main()
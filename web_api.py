@@ -29,8 +29,8 @@ BACKEND_TYPE = os.environ.get('BACKEND_TYPE', 'traditional').lower()
 if BACKEND_TYPE == 'supabase':
     # Import Supabase client if specified
     try:
-        from supabase_client import SupabaseClient
-        supabase = SupabaseClient()
+        from supabase_client import get_supabase_client
+        supabase = get_supabase_client()
         print("✅ Using Supabase backend")
     except ImportError:
         print("❌ Supabase client not found. Falling back to traditional backend.")